@@ -1,20 +1,46 @@
 """The RDW Vehicle Information integration."""
 import logging
-import os  # <-- Import os for directory checking
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
-
-from .api import RdwApiClient # Assuming this is correctly named in your api.py
-from .const import DOMAIN, CONF_LICENSE_PLATE, PLATFORMS, DEFAULT_UPDATE_INTERVAL
-from .coordinator import RdwDataUpdateCoordinator # Assuming this is correctly named in your coordinator.py
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.typing import ConfigType
+
+from .const import (
+    DOMAIN, CONF_LICENSE_PLATE, CONF_SENSORS, CONF_APP_TOKEN, CONF_ENTRY_TYPE, CONF_PLATES, ENTRY_TYPE_FLEET,
+    PLATFORMS, DEFAULT_UPDATE_INTERVAL, SIGNAL_SENSORS_UPDATED,
+)
+from .connection import async_get_api_client
+from .coordinator import RdwDataUpdateCoordinator, RdwFleetCoordinator
+from .plate_index import async_get_plate_index
+from .services import async_setup_services
 
 _LOGGER = logging.getLogger(__name__)
 
-# Define a key to track registration status in hass.data
-DATA_FILES_REGISTERED = f"{DOMAIN}_files_registered"
+# Data and options each entry's platforms were set up with, to diff option updates against
+DATA_APPLIED_CONFIG = f"{DOMAIN}_applied_config"
+
+
+def CONFIG_SCHEMA(config: ConfigType) -> ConfigType:
+    """Reject YAML configuration, the integration is set up from the UI only.
+
+    A plain callable instead of cv.config_entry_only_config_schema, so loading
+    the integration does not import config_validation.
+    """
+    if DOMAIN in config:
+        _LOGGER.error(
+            "The %s integration does not support YAML configuration, remove it from configuration.yaml "
+            "and add it from the UI instead", DOMAIN
+        )
+    return config
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the RDW Vehicle Information services, once for all entries."""
+    async_setup_services(hass)
+    return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -22,53 +48,60 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     _LOGGER.debug("Setting up RDW entry: %s (Title: %s)", entry.entry_id, entry.title)
     hass.data.setdefault(DOMAIN, {})
 
-    # --- FIX: Register static path only once ---
-    if DATA_FILES_REGISTERED not in hass.data:
-        _LOGGER.debug("Attempting to register static path %s_files", DOMAIN)
-        hass.data[DATA_FILES_REGISTERED] = True # Mark as attempted prevent re-entry
-        try:
-            www_path = hass.config.path(f"custom_components/{DOMAIN}/www")
-            # Check if the www directory exists before trying to register
-            if await hass.async_add_executor_job(os.path.isdir, www_path):
-                hass.http.register_static_path(
-                    f"/{DOMAIN}_files", www_path, cache_headers=False
-                )
-                _LOGGER.info("Successfully registered static path for %s www directory.", DOMAIN)
-            else:
-                _LOGGER.debug("Integration www directory not found at %s, skipping static path registration.", www_path)
-        except Exception as e:
-            # Log error but continue setup - static path is for optional images
-            _LOGGER.error("Error registering static path '/%s_files': %s", DOMAIN, e, exc_info=True)
-    # --- END FIX ---
-
-    license_plate = entry.data[CONF_LICENSE_PLATE]
-    session = async_get_clientsession(hass)
-    api_client = RdwApiClient(session)
-
-    coordinator = RdwDataUpdateCoordinator(
-        hass=hass,
-        name=f"RDW Coordinator {license_plate}",
-        client=api_client,
-        license_plate=license_plate,
-        update_interval=DEFAULT_UPDATE_INTERVAL, # Can be made configurable later if needed
-    )
+    # Clients with the same app token share one rate limiter across all entries
+    api_client = async_get_api_client(hass, entry.options.get(CONF_APP_TOKEN))
+
+    if entry.data.get(CONF_ENTRY_TYPE) == ENTRY_TYPE_FLEET:
+        # One coordinator refreshes every plate of the fleet together
+        plates = entry.data[CONF_PLATES]
+        coordinator = RdwFleetCoordinator(
+            hass=hass,
+            name=f"RDW Fleet Coordinator {entry.title}",
+            client=api_client,
+            license_plates=plates,
+            update_interval=DEFAULT_UPDATE_INTERVAL,
+        )
+        _async_remove_stale_fleet_devices(hass, entry, plates)
+    else:
+        license_plate = entry.data[CONF_LICENSE_PLATE]
+        coordinator = RdwDataUpdateCoordinator(
+            hass=hass,
+            name=f"RDW Coordinator {license_plate}",
+            client=api_client,
+            license_plate=license_plate,
+            update_interval=DEFAULT_UPDATE_INTERVAL, # Can be made configurable later if needed
+        )
 
     # Fetch initial data so we have it when entities are set up
     await coordinator.async_config_entry_first_refresh()
 
     hass.data[DOMAIN][entry.entry_id] = coordinator
+    # Configured plates are known to exist, so misread plates can be matched against them
+    # (removed again on unload, so plates dropped from a fleet are no longer suggested)
+    async_get_plate_index(hass).add_many(_coordinator_plates(coordinator))
 
     # Set up platforms (sensor, image)
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
     # Set up listener for options updates
+    hass.data.setdefault(DATA_APPLIED_CONFIG, {})[entry.entry_id] = (dict(entry.data), dict(entry.options))
     entry.async_on_unload(entry.add_update_listener(async_update_options))
 
-    # --- The original register_static_path call is removed from here ---
-
     return True
 
 
+def _async_remove_stale_fleet_devices(hass: HomeAssistant, entry: ConfigEntry, plates: list[str]) -> None:
+    """Detach devices of plates that were removed from a fleet entry."""
+    device_registry = dr.async_get(hass)
+    # The fleet's own device (aggregate sensors) is identified by the entry id
+    current = {*plates, entry.entry_id}
+    for device in dr.async_entries_for_config_entry(device_registry, entry.entry_id):
+        device_plates = {identifier for domain, identifier in device.identifiers if domain == DOMAIN}
+        if device_plates and not device_plates & current:
+            _LOGGER.debug("Removing device %s no longer part of fleet %s", device.name, entry.title)
+            device_registry.async_update_device(device.id, remove_config_entry_id=entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     _LOGGER.debug("Unloading RDW entry: %s", entry.entry_id)
@@ -76,19 +109,55 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        # Plates no longer configured (e.g. dropped from a fleet) stop being suggested by search_plate;
+        # a reload adds the entry's current plates back
+        configured = {
+            plate for other in hass.data[DOMAIN].values() for plate in _coordinator_plates(other)
+        }
+        async_get_plate_index(hass).remove_many(
+            plate for plate in _coordinator_plates(coordinator) if plate not in configured
+        )
+        hass.data.get(DATA_APPLIED_CONFIG, {}).pop(entry.entry_id, None)
         _LOGGER.debug("Successfully unloaded RDW entry: %s", entry.entry_id)
 
-        # --- Optional: Clean up registration flag if last entry ---
-        # Note: Does not actually unregister path as that's unreliable via hass.http
-        if not hass.data[DOMAIN] and DATA_FILES_REGISTERED in hass.data:
-             _LOGGER.debug("Last RDW entry unloaded, removing registration flag.")
-             hass.data.pop(DATA_FILES_REGISTERED, None)
-
     return unload_ok
 
 
+def _coordinator_plates(coordinator: RdwDataUpdateCoordinator | RdwFleetCoordinator) -> list[str]:
+    """Return the plates an entry's coordinator refreshes."""
+    if isinstance(coordinator, RdwFleetCoordinator):
+        return list(coordinator.coordinators)
+    return [coordinator.license_plate]
+
+
 async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
-    """Handle options update."""
-    _LOGGER.debug("Reloading RDW entry due to options update: %s", entry.entry_id)
-    await hass.config_entries.async_reload(entry.entry_id)
\ No newline at end of file
+    """Handle options update.
+
+    A change to only the sensor selection is applied in place by the sensor and
+    image platforms, reusing the coordinator's data; anything else reloads the entry.
+    """
+    applied = hass.data.get(DATA_APPLIED_CONFIG, {}).get(entry.entry_id)
+    if applied is None:
+        # Entry is unloaded or a reload triggered by an earlier update is already running
+        return
+    applied_data, applied_options = applied
+    new_options = dict(entry.options)
+    if applied_data == dict(entry.data) and applied_options == new_options:
+        return
+
+    other_options_changed = (
+        {key: value for key, value in applied_options.items() if key != CONF_SENSORS}
+        != {key: value for key, value in new_options.items() if key != CONF_SENSORS}
+    )
+    if applied_data != dict(entry.data) or other_options_changed:
+        _LOGGER.debug("Reloading RDW entry due to options update: %s", entry.entry_id)
+        # The fleet plates step updates data and options separately; the second listener call
+        # finds no applied config and leaves it to this reload instead of starting another one
+        hass.data[DATA_APPLIED_CONFIG].pop(entry.entry_id)
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+
+    _LOGGER.debug("Applying sensor selection change in place for RDW entry: %s", entry.entry_id)
+    hass.data[DATA_APPLIED_CONFIG][entry.entry_id] = (applied_data, new_options)
+    async_dispatcher_send(hass, SIGNAL_SENSORS_UPDATED.format(entry.entry_id))
\ No newline at end of file
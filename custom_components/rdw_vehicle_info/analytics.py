@@ -0,0 +1,92 @@
+"""Columnar fleet table and vectorized aggregates for RDW Vehicle Information."""
+from collections.abc import Iterable, Mapping
+from datetime import date
+from typing import Any, Final
+
+import numpy as np
+
+# Missing dates are stored as NaT, which never matches a date comparison
+_NAT: Final = np.datetime64("NaT", "D")
+_DAYS_PER_YEAR: Final = 365.25
+
+
+def _parse_date(record: Mapping[str, Any], key: str) -> np.datetime64:
+    """Return a record date as datetime64, preferring the ISO "_dt" field over YYYYMMDD."""
+    value = record.get(f"{key}_dt")
+    if isinstance(value, str) and len(value) >= 10:
+        candidate = value[:10]
+    else:
+        value = record.get(key)
+        if not isinstance(value, str) or len(value) != 8:
+            return _NAT
+        candidate = f"{value[:4]}-{value[4:6]}-{value[6:]}"
+    try:
+        return np.datetime64(candidate, "D")
+    except ValueError:
+        return _NAT
+
+
+def _parse_float(value: Any) -> float:
+    """Return a numeric RDW value as float, NaN if it is missing or not a number."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+class FleetTable:
+    """NumPy columns holding the fields the fleet aggregates need, one row per plate.
+
+    Rows are overwritten in place whenever a plate's record changes, so the
+    aggregates are single vectorized passes over contiguous arrays instead of
+    loops over records or entity states.
+    """
+
+    def __init__(self, license_plates: Iterable[str]) -> None:
+        """Initialize an empty row for every plate."""
+        self._rows: dict[str, int] = {plate: row for row, plate in enumerate(license_plates)}
+        size = len(self._rows)
+        self.apk_expiry = np.full(size, _NAT, dtype="datetime64[D]")
+        self.first_admission = np.full(size, _NAT, dtype="datetime64[D]")
+        self.catalog_price = np.full(size, np.nan, dtype=np.float64)
+        self.open_recall = np.zeros(size, dtype=np.bool_)
+
+    def __len__(self) -> int:
+        """Return the number of plates in the table."""
+        return len(self._rows)
+
+    def update(self, license_plate: str, record: Mapping[str, Any] | None) -> None:
+        """Overwrite the row of one plate with its latest record (None clears it)."""
+        row = self._rows.get(license_plate)
+        if row is None:
+            return
+        record = record or {}
+        self.apk_expiry[row] = _parse_date(record, "vervaldatum_apk")
+        self.first_admission[row] = _parse_date(record, "datum_eerste_toelating")
+        self.catalog_price[row] = _parse_float(record.get("catalogusprijs"))
+        self.open_recall[row] = record.get("openstaande_terugroepactie_indicator") == "Ja"
+
+    def apk_expiring(self, today: date, days: int) -> int:
+        """Return how many APKs expire between today and today + days (inclusive)."""
+        start = np.datetime64(today, "D")
+        expiry = self.apk_expiry
+        return int(np.count_nonzero((expiry >= start) & (expiry <= start + days)))
+
+    def total_catalog_price(self) -> float | None:
+        """Return the summed catalog price, None if no vehicle has one."""
+        known = ~np.isnan(self.catalog_price)
+        if not known.any():
+            return None
+        return float(self.catalog_price[known].sum())
+
+    def average_age(self, today: date) -> float | None:
+        """Return the average age in years since first admission, None if unknown."""
+        admitted = self.first_admission[~np.isnat(self.first_admission)]
+        if not admitted.size:
+            return None
+        days = (np.datetime64(today, "D") - admitted).astype(np.float64)
+        return round(float(days.mean()) / _DAYS_PER_YEAR, 1)
+
+    def open_recalls(self) -> int:
+        """Return how many vehicles have an open recall."""
+        return int(np.count_nonzero(self.open_recall))
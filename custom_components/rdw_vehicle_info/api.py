@@ -1,17 +1,25 @@
 """API Client for RDW Vehicle Information."""
 import asyncio
+import codecs
+import json
 import logging
 import socket
+import time
+from collections.abc import AsyncIterator, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from typing import Any
 
 import async_timeout
 from aiohttp import ClientError, ClientSession
-from bs4 import BeautifulSoup # Import BeautifulSoup
 
 from .const import (
-    API_BASE_URL, API_PARAM_LICENSE_PLATE, API_TIMEOUT,
+    API_BASE_URL, API_PARAM_LICENSE_PLATE, API_PARAM_WHERE, API_PARAM_LIMIT, API_TIMEOUT,
+    API_RECALL_STATUS_URL, API_RECALL_URL, API_PARAM_RECALL_CODE,
+    API_APP_TOKEN_HEADER, API_QUOTA_HEADERS, API_THROTTLED_BACKOFF, HTTP_VALIDATOR_HEADERS,
     STOLEN_REGISTER_URL, STOLEN_REGISTER_PARAM_SEARCH, STOLEN_REGISTER_PARAM_LANG
 )
+from .plate import normalize_license_plate
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -25,38 +33,254 @@ class RdwApiConnectionError(RdwApiError):
 class RdwApiNoDataError(RdwApiError):
     """RDW API No Data Error (e.g., invalid license plate)."""
 
+class RdwApiInvalidPlateError(RdwApiNoDataError):
+    """License plate is not a valid Dutch plate; rejected without a request."""
+
 # Add a new exception for scraping errors
 class StolenRegisterError(RdwApiError):
     """Error fetching data from Stolen Register."""
 
+class RdwApiNotModified(Exception):
+    """Conditional request answered with 304, the caller's last result is still current."""
+
+
+def _conditional_headers(headers: Mapping[str, str], validators: dict[str, str] | None) -> Mapping[str, str]:
+    """Return request headers extended with the stored validators (If-None-Match / If-Modified-Since)."""
+    if not validators:
+        return headers
+    return {**headers, **validators}
+
+
+def _store_validators(validators: dict[str, str] | None, response_headers: Mapping[str, str]) -> None:
+    """Replace the stored validators with those of a full (200) response."""
+    if validators is None:
+        return
+    validators.clear()
+    validators.update(
+        (request_header, response_headers[response_header])
+        for response_header, request_header in HTTP_VALIDATOR_HEADERS.items()
+        if response_header in response_headers
+    )
+
+class JsonArrayStreamDecoder:
+    """Incrementally decode a JSON array of objects fed in arbitrary chunks.
+
+    Only the current partial element is buffered, so memory stays bounded by
+    the size of a single row regardless of how many rows the array holds.
+    """
+
+    _WHITESPACE = " \t\r\n"
+
+    def __init__(self) -> None:
+        """Initialize the decoder."""
+        self._decoder = json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._started = False
+        self._finished = False
+
+    def feed(self, chunk: bytes) -> list[Any]:
+        """Feed a chunk of the response body and return the elements completed by it."""
+        self._buffer += self._text.decode(chunk)
+        elements: list[Any] = []
+        pos = 0
+        buffer = self._buffer
+        while not self._finished:
+            # Skip whitespace and the separators between elements
+            while pos < len(buffer) and (buffer[pos] in self._WHITESPACE or (self._started and buffer[pos] == ",")):
+                pos += 1
+            if pos >= len(buffer):
+                break
+            if not self._started:
+                if buffer[pos] != "[":
+                    raise ValueError("RDW response is not a JSON array")
+                self._started = True
+                pos += 1
+                continue
+            if buffer[pos] == "]":
+                self._finished = True
+                pos += 1
+                break
+            try:
+                element, pos = self._decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                break # Element is incomplete, wait for the next chunk
+            elements.append(element)
+        self._buffer = buffer[pos:]
+        return elements
+
+    def close(self) -> None:
+        """Verify the whole array was received."""
+        if not self._finished:
+            raise ValueError("RDW response ended before the JSON array was complete")
+
+
+def parse_stolen_register_page(html: str) -> bool:
+    """Return True if a stolen register results page lists the object (runs in a worker)."""
+    # Imported here so bs4 is only loaded once a stolen check actually runs
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+
+    # --- Parsing Logic ---
+    # Based on your HTML snippet, the "no result" message is in a specific div within panel-4
+    no_result_div = soup.select_one("#panel-4 div.card-block p")
+
+    # Check if the 'no result' message paragraph exists and contains the expected text
+    # If the 'no result' div/text is NOT found, assume it IS listed (stolen)
+    return not (no_result_div and "Uw zoekopdracht naar het object heeft geen resultaat opgeleverd" in no_result_div.text)
+
+
+class HtmlParserPool:
+    """Bounded worker pool that parses stolen register pages off the event loop.
+
+    At most max_pending pages are queued or being parsed; further callers wait
+    for a slot, so a fleet refresh cannot pile up page bodies faster than the
+    workers parse them. Callers only get the verdict back.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int) -> None:
+        """Initialize the pool."""
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="rdw_stolen_parser")
+        self._slots = asyncio.Semaphore(max_pending)
+        self.parsed = 0
+        self.waited = 0
+
+    async def async_parse_stolen_page(self, html: str) -> bool:
+        """Parse a stolen register page in a worker and return its verdict."""
+        if self._slots.locked():
+            self.waited += 1
+        async with self._slots:
+            result = await asyncio.get_running_loop().run_in_executor(
+                self._executor, parse_stolen_register_page, html
+            )
+        self.parsed += 1
+        return result
+
+    def shutdown(self) -> None:
+        """Stop the workers, dropping pages that were not parsed yet."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def as_dict(self) -> dict[str, int]:
+        """Return parse counters (for diagnostics)."""
+        return {"parsed": self.parsed, "waited_for_slot": self.waited}
+
+
+class RdwRateLimiter:
+    """Space out requests to the RDW (Socrata) API and track its quota.
+
+    One limiter is shared by all clients using the same app token (or by all
+    anonymous clients), since Socrata throttles per token or per IP address.
+    """
+
+    def __init__(self, min_interval: float, max_concurrent: int) -> None:
+        """Initialize the rate limiter."""
+        self._min_interval = min_interval
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._lock = asyncio.Lock()
+        self._next_request = 0.0
+        self.requests = 0
+        self.throttled = 0
+        self.last_throttled: float | None = None
+        self.quota: dict[str, str] = {}
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[None]:
+        """Wait for a request slot."""
+        async with self._semaphore:
+            async with self._lock:
+                loop = asyncio.get_running_loop()
+                delay = self._next_request - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                self._next_request = max(loop.time(), self._next_request) + self._min_interval
+            yield
+
+    def record_response(self, status: int, headers: Mapping[str, str]) -> None:
+        """Record quota headers of a response and back off when throttled."""
+        self.requests += 1
+        for header in API_QUOTA_HEADERS:
+            if header in headers:
+                self.quota[header] = headers[header]
+        if status == 429:
+            self.throttled += 1
+            self.last_throttled = time.time()
+            try:
+                backoff = float(headers.get("Retry-After", API_THROTTLED_BACKOFF))
+            except ValueError:
+                backoff = API_THROTTLED_BACKOFF
+            _LOGGER.warning("RDW API is throttling requests, backing off for %s seconds", backoff)
+            self._next_request = max(self._next_request, asyncio.get_running_loop().time() + backoff)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the tracked quota information (for diagnostics)."""
+        return {
+            "min_interval": self._min_interval,
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "last_throttled": self.last_throttled,
+            "quota_headers": dict(self.quota),
+        }
+
+
 class RdwApiClient:
     """RDW API Client."""
 
-    def __init__(self, session: ClientSession):
+    def __init__(
+        self,
+        session: ClientSession,
+        app_token: str | None = None,
+        rate_limiter: RdwRateLimiter | None = None,
+        parser_pool: HtmlParserPool | None = None,
+    ):
         """Initialize the API client."""
         self._session = session
         self._rdw_base_url = API_BASE_URL
         self._stolen_base_url = STOLEN_REGISTER_URL
+        # Socrata throttles anonymous traffic much harder than requests carrying an app token
+        self._rdw_headers = {API_APP_TOKEN_HEADER: app_token} if app_token else {}
+        self.rate_limiter = rate_limiter or RdwRateLimiter(min_interval=0, max_concurrent=1)
+        # Without a pool (e.g. config flow validation) pages are parsed inline
+        self.parser_pool = parser_pool
 
-    async def get_vehicle_data(self, license_plate: str) -> dict[str, Any]:
-        """Fetch vehicle data for a given license plate from RDW."""
-        # Ensure license plate is uppercase and formatted correctly (optional, API might handle)
-        formatted_plate = license_plate.upper().replace("-", "")
+    async def get_vehicle_data(
+        self, license_plate: str, validators: dict[str, str] | None = None
+    ) -> dict[str, Any]:
+        """Fetch vehicle data for a given license plate from RDW.
+
+        If a validators dict is given, its stored validators are sent with the
+        request and replaced by those of a full response. A 304 answer raises
+        RdwApiNotModified without reading or decoding a body.
+        """
+        # Validate and normalize locally, impossible plates never cost a request
+        formatted_plate = normalize_license_plate(license_plate)
+        if formatted_plate is None:
+            raise RdwApiInvalidPlateError(f"{license_plate!r} is not a valid Dutch license plate")
         url = f"{self._rdw_base_url}?{API_PARAM_LICENSE_PLATE}={formatted_plate}"
         _LOGGER.debug("Requesting RDW data from: %s", url)
 
         try:
-            async with async_timeout.timeout(API_TIMEOUT):
-                response = await self._session.get(url)
-                response.raise_for_status()  # Raise HTTPError for bad responses (4xx or 5xx)
+            async with self.rate_limiter.acquire(), async_timeout.timeout(API_TIMEOUT):
+                # Context manager releases the connection back to the pool as soon as the body is read
+                async with self._session.get(
+                    url, headers=_conditional_headers(self._rdw_headers, validators)
+                ) as response:
+                    self.rate_limiter.record_response(response.status, response.headers)
+                    if response.status == 304:
+                        _LOGGER.debug("RDW data for %s not modified", formatted_plate)
+                        raise RdwApiNotModified
+                    response.raise_for_status()  # Raise HTTPError for bad responses (4xx or 5xx)
 
-                data = await response.json()
+                    data = await response.json()
+                    response_headers = response.headers
                 _LOGGER.debug("Received RDW data: %s", data)
 
                 if not data or not isinstance(data, list) or len(data) == 0:
                     _LOGGER.warning("No data found for license plate %s from RDW", formatted_plate)
                     raise RdwApiNoDataError(f"No data found from RDW for license plate {formatted_plate}")
 
+                # Only remember validators of a response that actually held data
+                _store_validators(validators, response_headers)
                 # API returns a list with one item
                 return data[0]
 
@@ -66,42 +290,165 @@ class RdwApiClient:
         except (ClientError, socket.gaierror) as exc:
             _LOGGER.error("Communication error occurred while requesting RDW data for %s: %s", formatted_plate, exc)
             raise RdwApiConnectionError(f"Communication error with RDW API for {formatted_plate}") from exc
+        except (RdwApiError, RdwApiNotModified):
+            raise
         except Exception as exc:
             _LOGGER.error("An unexpected error occurred while fetching RDW data for %s: %s", formatted_plate, exc)
             # Catch any other unexpected exceptions during RDW fetch
             raise RdwApiError(f"Unexpected error during RDW fetch for {formatted_plate}: {exc}") from exc
 
 
-    async def async_check_stolen(self, license_plate: str) -> bool | None:
-        """Check if a license plate is listed as stolen."""
-        formatted_plate = license_plate.upper().replace("-", "")
+    async def iter_vehicles_data(
+        self, license_plates: list[str], validators: dict[str, str] | None = None
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Fetch vehicle data for several license plates, yielding rows as they arrive.
+
+        The response body is decoded incrementally, so callers can hand each
+        row on before the rest of the batch has been received. Validators work
+        as in get_vehicle_data; they are only replaced once the whole batch has
+        been consumed, and a 304 raises RdwApiNotModified before any row.
+        """
+        formatted_plates = [
+            plate for plate in map(normalize_license_plate, license_plates) if plate is not None
+        ]
+        if not formatted_plates:
+            return
+        plate_list = ",".join(f"'{plate}'" for plate in formatted_plates)
+        params = {
+            API_PARAM_WHERE: f"{API_PARAM_LICENSE_PLATE} in({plate_list})",
+            API_PARAM_LIMIT: str(len(formatted_plates)),
+        }
+        _LOGGER.debug("Requesting RDW data for %d plates", len(formatted_plates))
+
+        try:
+            async with self.rate_limiter.acquire():
+                # The timeout applies to connecting and to each read, not to the whole
+                # stream, so it never spans a yield back to the consumer.
+                async with async_timeout.timeout(API_TIMEOUT):
+                    response = await self._session.get(
+                        self._rdw_base_url, params=params, headers=_conditional_headers(self._rdw_headers, validators)
+                    )
+                async with response:
+                    self.rate_limiter.record_response(response.status, response.headers)
+                    if response.status == 304:
+                        _LOGGER.debug("RDW data for %d plates not modified", len(formatted_plates))
+                        raise RdwApiNotModified
+                    response.raise_for_status()
+
+                    decoder = JsonArrayStreamDecoder()
+                    while True:
+                        async with async_timeout.timeout(API_TIMEOUT):
+                            chunk = await response.content.readany()
+                        if not chunk:
+                            break
+                        for row in decoder.feed(chunk):
+                            if isinstance(row, dict) and API_PARAM_LICENSE_PLATE in row:
+                                yield row
+                    decoder.close()
+                    _store_validators(validators, response.headers)
+
+        except asyncio.TimeoutError as exc:
+            _LOGGER.error("Timeout occurred while requesting RDW data for %d plates: %s", len(formatted_plates), exc)
+            raise RdwApiConnectionError(f"Timeout connecting to RDW API for {len(formatted_plates)} plates") from exc
+        except (ClientError, socket.gaierror) as exc:
+            _LOGGER.error("Communication error occurred while requesting RDW data for %d plates: %s", len(formatted_plates), exc)
+            raise RdwApiConnectionError(f"Communication error with RDW API for {len(formatted_plates)} plates") from exc
+        except (RdwApiError, RdwApiNotModified):
+            raise
+        except Exception as exc:
+            _LOGGER.error("An unexpected error occurred while fetching RDW data for %d plates: %s", len(formatted_plates), exc)
+            raise RdwApiError(f"Unexpected error during RDW batch fetch: {exc}") from exc
+
+
+    async def get_recalls(self, license_plate: str) -> list[dict[str, Any]]:
+        """Fetch the recalls of one vehicle, each status row joined with its recall details.
+
+        Costs one request for the plate's recall statuses and, if there are
+        any, one request for the details of all referenced recalls.
+        """
+        formatted_plate = normalize_license_plate(license_plate)
+        if formatted_plate is None:
+            raise RdwApiInvalidPlateError(f"{license_plate!r} is not a valid Dutch license plate")
+        _LOGGER.debug("Requesting RDW recalls for %s", formatted_plate)
+
+        statuses = await self._async_query(API_RECALL_STATUS_URL, {API_PARAM_LICENSE_PLATE: formatted_plate})
+        codes = sorted({row[API_PARAM_RECALL_CODE] for row in statuses if API_PARAM_RECALL_CODE in row})
+        details: dict[str, dict[str, Any]] = {}
+        if codes:
+            code_list = ",".join("'{}'".format(code.replace("'", "''")) for code in codes)
+            rows = await self._async_query(API_RECALL_URL, {
+                API_PARAM_WHERE: f"{API_PARAM_RECALL_CODE} in({code_list})",
+                API_PARAM_LIMIT: str(len(codes)),
+            })
+            details = {row[API_PARAM_RECALL_CODE]: row for row in rows if API_PARAM_RECALL_CODE in row}
+
+        # The plate's own status fields take precedence over the shared recall details
+        return [{**details.get(status.get(API_PARAM_RECALL_CODE), {}), **status} for status in statuses]
+
+
+    async def _async_query(self, url: str, params: dict[str, str]) -> list[dict[str, Any]]:
+        """Run one paced Socrata query and return its rows."""
+        try:
+            async with self.rate_limiter.acquire(), async_timeout.timeout(API_TIMEOUT):
+                async with self._session.get(url, params=params, headers=self._rdw_headers) as response:
+                    self.rate_limiter.record_response(response.status, response.headers)
+                    response.raise_for_status()
+
+                    data = await response.json()
+        except asyncio.TimeoutError as exc:
+            raise RdwApiConnectionError(f"Timeout connecting to RDW API ({url})") from exc
+        except (ClientError, socket.gaierror) as exc:
+            raise RdwApiConnectionError(f"Communication error with RDW API ({url}): {exc}") from exc
+        except Exception as exc:
+            raise RdwApiError(f"Unexpected error during RDW query ({url}): {exc}") from exc
+
+        if not isinstance(data, list):
+            raise RdwApiError(f"Unexpected response from RDW API ({url})")
+        return [row for row in data if isinstance(row, dict)]
+
+
+    async def async_check_stolen(
+        self, license_plate: str, validators: dict[str, str] | None = None
+    ) -> bool | None:
+        """Check if a license plate is listed as stolen.
+
+        Validators work as in get_vehicle_data, for when the register sends
+        them; a 304 raises RdwApiNotModified without parsing the page.
+        """
+        formatted_plate = normalize_license_plate(license_plate)
+        if formatted_plate is None:
+            _LOGGER.debug("Skipping stolen register check for invalid license plate %r", license_plate)
+            return None
         # Construct the URL for the stolen register search
         url = f"{self._stolen_base_url}?{STOLEN_REGISTER_PARAM_LANG}=1&{STOLEN_REGISTER_PARAM_SEARCH}={formatted_plate}"
         _LOGGER.debug("Checking stolen register for: %s (URL: %s)", formatted_plate, url)
 
         try:
             async with async_timeout.timeout(API_TIMEOUT): # Reuse the same timeout constant
-                response = await self._session.get(url)
-                response.raise_for_status() # Raise HTTPError for bad responses
+                async with self._session.get(url, headers=_conditional_headers({}, validators)) as response:
+                    if response.status == 304:
+                        _LOGGER.debug("Stolen register page for %s not modified", formatted_plate)
+                        raise RdwApiNotModified
+                    response.raise_for_status() # Raise HTTPError for bad responses
 
-                html = await response.text()
+                    html = await response.text()
+                    response_headers = response.headers
                 _LOGGER.debug("Received HTML from stolen register (partial): %s...", html[:500]) # Log start of HTML
 
-                soup = BeautifulSoup(html, "html.parser")
-
-                # --- Parsing Logic ---
-                # Based on your HTML snippet, the "no result" message is in a specific div within panel-4
-                no_result_div = soup.select_one("#panel-4 div.card-block p")
-
-                # Check if the 'no result' message paragraph exists and contains the expected text
-                if no_result_div and "Uw zoekopdracht naar het object heeft geen resultaat opgeleverd" in no_result_div.text:
-                    _LOGGER.debug("Stolen register check: No stolen object found for %s", formatted_plate)
-                    return False # Not registered as stolen
-                else:
-                     # If the 'no result' div/text is NOT found, assume it IS listed (stolen)
-                    _LOGGER.debug("Stolen register check: Object found (likely stolen) for %s", formatted_plate)
-                    return True # Listed as stolen
+            # Parsing runs outside the request timeout; the pool applies its own backpressure
+            if self.parser_pool is not None:
+                is_stolen = await self.parser_pool.async_parse_stolen_page(html)
+            else:
+                is_stolen = parse_stolen_register_page(html)
+            if is_stolen:
+                _LOGGER.debug("Stolen register check: Object found (likely stolen) for %s", formatted_plate)
+            else:
+                _LOGGER.debug("Stolen register check: No stolen object found for %s", formatted_plate)
+            _store_validators(validators, response_headers)
+            return is_stolen
 
+        except RdwApiNotModified:
+            raise
         except asyncio.TimeoutError as exc:
             _LOGGER.error("Timeout occurred while checking stolen register for %s: %s", formatted_plate, exc)
             # Return None to indicate stolen status could not be determined
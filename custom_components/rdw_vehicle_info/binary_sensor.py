@@ -12,8 +12,8 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import StateType
 
 # Import constants and the base entity
-from .const import DOMAIN, DATA_KEY_IS_STOLEN
-from .coordinator import RdwDataUpdateCoordinator # Ensure coordinator is imported
+from .const import DATA_KEY_IS_STOLEN
+from .coordinator import RdwDataUpdateCoordinator, get_entry_coordinators
 from .entity import RdwEntity # Ensure base entity is imported
 
 _LOGGER = logging.getLogger(__name__)
@@ -25,21 +25,20 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the RDW binary sensor platform."""
-    # Get the coordinator instance for this config entry
-    coordinator: RdwDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    # Get the plate coordinators for this config entry (one, or one per fleet plate)
+    coordinators = get_entry_coordinators(hass, entry)
 
     entities = []
 
     # Add the stolen status binary sensor
-    _LOGGER.debug("Adding RDW Stolen Status binary sensor for %s", coordinator.license_plate)
-    entities.append(RdwStolenBinarySensor(coordinator))
+    _LOGGER.debug("Adding RDW Stolen Status binary sensors for %s", entry.title)
+    entities.extend(RdwStolenBinarySensor(coordinator) for coordinator in coordinators)
 
     # Add other binary sensors here if needed in the future
 
     # Add the created entities to Home Assistant
-    # The 'True' parameter requests an initial update of the coordinator data
-    # before the entities are added to the state machine.
-    async_add_entities(entities, True)
+    # Coordinators already hold data from the first refresh, so no update before adding.
+    async_add_entities(entities)
 
 
 class RdwStolenBinarySensor(RdwEntity, BinarySensorEntity):
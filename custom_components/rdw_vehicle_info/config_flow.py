@@ -1,21 +1,33 @@
 """Config flow for RDW Vehicle Information."""
 import logging
+import re
 from typing import Any, Dict, Optional
 
 import voluptuous as vol
 from aiohttp import ClientError
 
 from homeassistant import config_entries
-from homeassistant.core import callback
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.const import CONF_NAME
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.selector import TextSelector, TextSelectorConfig
+from homeassistant.util import slugify
 # SchemaAttributeChecker might not be needed if only using basic schemas now
 # from homeassistant.helpers.schema_attribute_checker import SchemaAttributeChecker
 
-from .api import RdwApiClient, RdwApiConnectionError, RdwApiNoDataError
+from .api import RdwApiConnectionError, RdwApiNoDataError
+from .connection import async_get_api_client
+from .plate import normalize_license_plate
 from .const import (
     DOMAIN,
     CONF_LICENSE_PLATE,
     CONF_SENSORS,
+    CONF_COMPACT_MODE,
+    CONF_APP_TOKEN,
+    CONF_ENTRY_TYPE,
+    CONF_PLATES,
+    CONF_ADD_PLATES,
+    CONF_REMOVE_PLATES,
+    ENTRY_TYPE_FLEET,
     # CONF_ENABLE_IMAGE, # No longer needed here
     RDW_API_KEYS,
     RDW_API_KEYS as DEFAULT_ENABLED_SENSOR_KEYS
@@ -28,6 +40,72 @@ USER_SCHEMA = vol.Schema({
     vol.Required(CONF_LICENSE_PLATE): str,
 })
 
+# Schema for the fleet step (name + pasted list of license plates)
+FLEET_SCHEMA = vol.Schema({
+    vol.Required(CONF_NAME): str,
+    vol.Required(CONF_PLATES): TextSelector(TextSelectorConfig(multiline=True)),
+})
+
+# Schema for adding/removing plates of an existing fleet
+PLATES_SCHEMA = vol.Schema({
+    vol.Optional(CONF_ADD_PLATES, default=""): TextSelector(TextSelectorConfig(multiline=True)),
+    vol.Optional(CONF_REMOVE_PLATES, default=""): TextSelector(TextSelectorConfig(multiline=True)),
+})
+
+# Separators accepted in pasted plate lists: new lines, commas, semicolons, tabs and quotes (CSV)
+_PLATE_LIST_SEPARATORS = re.compile(r"[\r\n,;\t\"']+")
+# Skipped entries listed by name in the confirmation step, the rest are only counted
+_MAX_LISTED_SKIPPED = 20
+
+
+def parse_plate_list(text: str) -> tuple[list[str], list[str]]:
+    """Parse a pasted list or CSV column of license plates into normalized plates.
+
+    Order is preserved and duplicates are dropped. Returns the plates and the
+    entries that are not a valid Dutch plate (such as a CSV header), so the
+    user can be told which ones were skipped.
+    """
+    plates: dict[str, None] = {}
+    invalid: dict[str, None] = {}
+    for token in _PLATE_LIST_SEPARATORS.split(text or ""):
+        plate = normalize_license_plate(token)
+        if plate:
+            plates[plate] = None
+        elif token.strip():
+            _LOGGER.debug("Ignoring %r in plate list, not a valid license plate", token)
+            invalid[token.strip()] = None
+    return list(plates), list(invalid)
+
+
+def skipped_plates_placeholders(invalid: list[str], configured: list[str]) -> dict[str, str]:
+    """Return the description placeholders listing skipped entries of a plate list."""
+
+    def _listed(values: list[str]) -> str:
+        listed = ", ".join(values[:_MAX_LISTED_SKIPPED])
+        if len(values) > _MAX_LISTED_SKIPPED:
+            listed += f", ... (+{len(values) - _MAX_LISTED_SKIPPED})"
+        return listed or "-"
+
+    return {
+        "invalid_count": str(len(invalid)),
+        "invalid": _listed(invalid),
+        "configured_count": str(len(configured)),
+        "configured": _listed(configured),
+    }
+
+
+def configured_plates(hass: HomeAssistant, exclude_entry_id: str | None = None) -> set[str]:
+    """Return all plates configured in vehicle and fleet entries."""
+    plates: set[str] = set()
+    for entry in hass.config_entries.async_entries(DOMAIN):
+        if entry.entry_id == exclude_entry_id:
+            continue
+        if entry.data.get(CONF_ENTRY_TYPE) == ENTRY_TYPE_FLEET:
+            plates.update(entry.data.get(CONF_PLATES, []))
+        elif CONF_LICENSE_PLATE in entry.data:
+            plates.add(entry.data[CONF_LICENSE_PLATE])
+    return plates
+
 # Function to generate the options schema dynamically
 # --- MODIFIED: Removed CONF_ENABLE_IMAGE ---
 def create_options_schema(options: Optional[Dict[str, Any]] = None) -> vol.Schema:
@@ -38,6 +116,10 @@ def create_options_schema(options: Optional[Dict[str, Any]] = None) -> vol.Schem
 
     schema_dict = {
         # --- REMOVED Image Option ---
+        vol.Optional(CONF_COMPACT_MODE, default=options.get(CONF_COMPACT_MODE, False)): bool,
+        vol.Optional(
+            CONF_APP_TOKEN, description={"suggested_value": options.get(CONF_APP_TOKEN)}
+        ): str,
         # Options for each sensor key
         **{
             vol.Optional(
@@ -58,6 +140,9 @@ class RdwConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     def __init__(self):
         """Initialize the config flow."""
         self.license_plate: Optional[str] = None
+        self._fleet_name: Optional[str] = None
+        self._fleet_plates: list[str] = []
+        self._skipped_placeholders: Dict[str, str] = {}
         # --- MODIFIED: Removed CONF_ENABLE_IMAGE ---
         # Store only sensor options now
         self._config_options: Dict[str, Any] = {CONF_SENSORS: {}}
@@ -68,12 +153,10 @@ class RdwConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         # (This function remains unchanged)
         errors: Dict[str, str] = {}
         try:
-            session = async_get_clientsession(self.hass)
-            client = RdwApiClient(session)
-            formatted_plate = license_plate.upper().replace("-", "")
-            _LOGGER.debug("Validating license plate: %s", formatted_plate)
-            await client.get_vehicle_data(formatted_plate)
-            _LOGGER.debug("License plate %s validation successful", formatted_plate)
+            client = async_get_api_client(self.hass)
+            _LOGGER.debug("Validating license plate: %s", license_plate)
+            await client.get_vehicle_data(license_plate)
+            _LOGGER.debug("License plate %s validation successful", license_plate)
         except RdwApiConnectionError:
             _LOGGER.warning("Connection error during validation for %s", license_plate)
             errors["base"] = "cannot_connect"
@@ -87,31 +170,85 @@ class RdwConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
 
     async def async_step_user(self, user_input: Optional[Dict[str, Any]] = None) -> config_entries.FlowResult:
-        """Handle the initial step where the user enters the license plate."""
+        """Let the user choose between a single vehicle and a fleet."""
+        return self.async_show_menu(step_id="user", menu_options=["vehicle", "fleet"])
+
+
+    async def async_step_vehicle(self, user_input: Optional[Dict[str, Any]] = None) -> config_entries.FlowResult:
+        """Handle the step where the user enters a single license plate."""
         # (This function remains largely unchanged, still calls async_step_options on success)
         errors: Dict[str, str] = {}
 
         if user_input is not None:
             license_plate_raw = user_input[CONF_LICENSE_PLATE]
-            self.license_plate = license_plate_raw.upper().replace("-", "")
+            self.license_plate = normalize_license_plate(license_plate_raw)
 
-            await self.async_set_unique_id(self.license_plate)
-            self._abort_if_unique_id_configured()
+            if self.license_plate is None:
+                # Rejected offline, no RDW round-trip for an impossible plate
+                errors[CONF_LICENSE_PLATE] = "invalid_license_plate"
+            else:
+                await self.async_set_unique_id(self.license_plate)
+                self._abort_if_unique_id_configured()
+                if self.license_plate in configured_plates(self.hass):
+                    # Already part of a fleet entry
+                    return self.async_abort(reason="already_configured")
 
-            errors = await self.async_validate_license_plate(self.license_plate)
+                errors = await self.async_validate_license_plate(self.license_plate)
 
-            if not errors:
-                _LOGGER.debug("License plate %s is valid, proceeding to options.", self.license_plate)
-                return await self.async_step_options()
+                if not errors:
+                    _LOGGER.debug("License plate %s is valid, proceeding to options.", self.license_plate)
+                    return await self.async_step_options()
 
         return self.async_show_form(
-            step_id="user",
+            step_id="vehicle",
             data_schema=USER_SCHEMA,
             errors=errors,
             description_placeholders={"error_details": errors.get("base", "")}
         )
 
 
+    async def async_step_fleet(self, user_input: Optional[Dict[str, Any]] = None) -> config_entries.FlowResult:
+        """Handle the step where the user pastes the plates of a fleet."""
+        errors: Dict[str, str] = {}
+
+        if user_input is not None:
+            self._fleet_name = user_input[CONF_NAME].strip()
+            await self.async_set_unique_id(f"fleet_{slugify(self._fleet_name)}")
+            self._abort_if_unique_id_configured()
+
+            # Plates are not validated upstream one by one; unknown plates simply stay unavailable
+            already_configured = configured_plates(self.hass)
+            plates, invalid = parse_plate_list(user_input[CONF_PLATES])
+            self._fleet_plates = [plate for plate in plates if plate not in already_configured]
+            configured = [plate for plate in plates if plate in already_configured]
+
+            if self._fleet_plates:
+                _LOGGER.debug("Fleet %s with %d plates, proceeding to options.", self._fleet_name, len(self._fleet_plates))
+                if invalid or configured:
+                    self._skipped_placeholders = skipped_plates_placeholders(invalid, configured)
+                    return await self.async_step_fleet_skipped()
+                return await self.async_step_options()
+            errors[CONF_PLATES] = "no_valid_plates"
+
+        return self.async_show_form(
+            step_id="fleet",
+            data_schema=FLEET_SCHEMA,
+            errors=errors,
+        )
+
+
+    async def async_step_fleet_skipped(self, user_input: Optional[Dict[str, Any]] = None) -> config_entries.FlowResult:
+        """Tell the user which pasted entries were skipped before creating the fleet."""
+        if user_input is not None:
+            return await self.async_step_options()
+
+        return self.async_show_form(
+            step_id="fleet_skipped",
+            data_schema=vol.Schema({}),
+            description_placeholders={"count": str(len(self._fleet_plates)), **self._skipped_placeholders},
+        )
+
+
     async def async_step_options(self, user_input: Optional[Dict[str, Any]] = None) -> config_entries.FlowResult:
         """Handle the options step where the user selects sensors."""
         errors: Dict[str, str] = {}
@@ -122,6 +259,16 @@ class RdwConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             self._config_options[CONF_SENSORS] = {
                  key: user_input.get(key, False) for key in RDW_API_KEYS if key in user_input
             }
+            self._config_options[CONF_COMPACT_MODE] = user_input.get(CONF_COMPACT_MODE, False)
+            self._config_options[CONF_APP_TOKEN] = user_input.get(CONF_APP_TOKEN, "").strip()
+
+            if self._fleet_name is not None:
+                _LOGGER.debug("Creating fleet entry %s with options: %s", self._fleet_name, self._config_options)
+                return self.async_create_entry(
+                    title=self._fleet_name,
+                    data={CONF_ENTRY_TYPE: ENTRY_TYPE_FLEET, CONF_PLATES: self._fleet_plates},
+                    options=self._config_options,
+                )
 
             _LOGGER.debug("Creating entry for %s with options: %s", self.license_plate, self._config_options)
 
@@ -138,7 +285,7 @@ class RdwConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             step_id="options",
             data_schema=options_schema,
             errors=errors,
-             description_placeholders={"license_plate": self.license_plate}
+             description_placeholders={"license_plate": self.license_plate or self._fleet_name}
         )
 
 
@@ -161,6 +308,9 @@ class RdwOptionsFlowHandler(config_entries.OptionsFlow):
         self._current_options = {
             CONF_SENSORS: config_entry.options.get(CONF_SENSORS, {})
         }
+        self._updated_options: Dict[str, Any] = {}
+        self._new_plates: list[str] = []
+        self._skipped_placeholders: Dict[str, str] = {}
 
 
     async def async_step_init(self, user_input: Optional[Dict[str, Any]] = None) -> config_entries.FlowResult:
@@ -173,19 +323,90 @@ class RdwOptionsFlowHandler(config_entries.OptionsFlow):
             updated_options = {
                 CONF_SENSORS: {
                     key: user_input.get(key, False) for key in RDW_API_KEYS if key in user_input
-                }
+                },
+                CONF_COMPACT_MODE: user_input.get(CONF_COMPACT_MODE, False),
+                CONF_APP_TOKEN: user_input.get(CONF_APP_TOKEN, "").strip(),
             }
+            if self.config_entry.data.get(CONF_ENTRY_TYPE) == ENTRY_TYPE_FLEET:
+                # Fleets get a second step to add or remove plates
+                self._updated_options = updated_options
+                return await self.async_step_plates()
+
             _LOGGER.debug("Updating options for %s to: %s", self.config_entry.entry_id, updated_options)
             # Update the config entry's options
             return self.async_create_entry(title="", data=updated_options)
 
         # Generate schema based on current sensor options stored in the config entry
         # Pass only sensor options to the schema generator
-        options_schema = create_options_schema({CONF_SENSORS: self.config_entry.options.get(CONF_SENSORS, {})})
+        options_schema = create_options_schema({
+            CONF_SENSORS: self.config_entry.options.get(CONF_SENSORS, {}),
+            CONF_COMPACT_MODE: self.config_entry.options.get(CONF_COMPACT_MODE, False),
+            CONF_APP_TOKEN: self.config_entry.options.get(CONF_APP_TOKEN),
+        })
 
         return self.async_show_form(
             step_id="init",
             data_schema=options_schema,
             errors=errors,
-            description_placeholders={"license_plate": self.config_entry.data.get(CONF_LICENSE_PLATE)}
+            description_placeholders={
+                "license_plate": self.config_entry.data.get(CONF_LICENSE_PLATE, self.config_entry.title)
+            }
+        )
+
+
+    async def async_step_plates(self, user_input: Optional[Dict[str, Any]] = None) -> config_entries.FlowResult:
+        """Bulk add or remove plates of a fleet entry."""
+        errors: Dict[str, str] = {}
+        current_plates: list[str] = list(self.config_entry.data.get(CONF_PLATES, []))
+
+        if user_input is not None:
+            remove_plates, invalid_remove = parse_plate_list(user_input.get(CONF_REMOVE_PLATES, ""))
+            add_plates, invalid_add = parse_plate_list(user_input.get(CONF_ADD_PLATES, ""))
+            to_remove = set(remove_plates)
+            # Skip plates configured elsewhere, their unique IDs would clash
+            elsewhere = configured_plates(self.hass, exclude_entry_id=self.config_entry.entry_id)
+            to_add = [plate for plate in add_plates if plate not in elsewhere and plate not in current_plates]
+            configured = [plate for plate in add_plates if plate in elsewhere]
+            new_plates = [plate for plate in current_plates if plate not in to_remove] + to_add
+
+            if new_plates:
+                self._new_plates = new_plates
+                if invalid_add or invalid_remove or configured:
+                    self._skipped_placeholders = skipped_plates_placeholders(invalid_add + invalid_remove, configured)
+                    return await self.async_step_plates_skipped()
+                return self._async_finish_plates()
+            errors["base"] = "no_valid_plates"
+
+        return self.async_show_form(
+            step_id="plates",
+            data_schema=PLATES_SCHEMA,
+            errors=errors,
+            description_placeholders={"name": self.config_entry.title, "count": str(len(current_plates))},
         )
+
+
+    async def async_step_plates_skipped(self, user_input: Optional[Dict[str, Any]] = None) -> config_entries.FlowResult:
+        """Tell the user which pasted entries were skipped before updating the fleet."""
+        if user_input is not None:
+            return self._async_finish_plates()
+
+        return self.async_show_form(
+            step_id="plates_skipped",
+            data_schema=vol.Schema({}),
+            description_placeholders={"count": str(len(self._new_plates)), **self._skipped_placeholders},
+        )
+
+
+    @callback
+    def _async_finish_plates(self) -> config_entries.FlowResult:
+        """Store the new plate list and the options collected in the first step."""
+        current_plates: list[str] = list(self.config_entry.data.get(CONF_PLATES, []))
+        if self._new_plates != current_plates:
+            _LOGGER.debug(
+                "Updating plates of fleet %s from %d to %d plates",
+                self.config_entry.title, len(current_plates), len(self._new_plates),
+            )
+            self.hass.config_entries.async_update_entry(
+                self.config_entry, data={**self.config_entry.data, CONF_PLATES: self._new_plates}
+            )
+        return self.async_create_entry(title="", data=self._updated_options)
@@ -0,0 +1,147 @@
+"""Shared HTTP session, API clients and rate limiting for RDW Vehicle Information."""
+import logging
+from types import SimpleNamespace
+from typing import Any
+
+from aiohttp import ClientSession, TCPConnector, TraceConfig
+
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import SERVER_SOFTWARE
+from homeassistant.util import ssl as ssl_util
+
+from .api import HtmlParserPool, RdwApiClient, RdwRateLimiter
+from .const import (
+    DOMAIN,
+    API_ANONYMOUS_MIN_INTERVAL,
+    API_ANONYMOUS_MAX_CONCURRENT,
+    API_TOKEN_MIN_INTERVAL,
+    API_TOKEN_MAX_CONCURRENT,
+    HTTP_CONNECTION_LIMIT,
+    HTTP_CONNECTION_LIMIT_PER_HOST,
+    HTTP_DNS_CACHE_TTL,
+    HTTP_KEEPALIVE_TIMEOUT,
+    STOLEN_PARSE_WORKERS,
+    STOLEN_PARSE_MAX_PENDING,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Rate limiters keyed by app token (None for anonymous requests), shared by all entries
+DATA_RATE_LIMITERS = f"{DOMAIN}_rate_limiters"
+# Dedicated session (and its connection statistics) for opendata.rdw.nl and the stolen register
+DATA_SESSION = f"{DOMAIN}_session"
+DATA_CONNECTION_STATS = f"{DOMAIN}_connection_stats"
+# Worker pool parsing stolen register pages, shared by all clients
+DATA_PARSER_POOL = f"{DOMAIN}_parser_pool"
+
+
+def _create_trace_config(stats: dict[str, int]) -> TraceConfig:
+    """Count new connections (TCP/TLS handshakes) versus reused keep-alive connections."""
+    trace_config = TraceConfig()
+
+    async def _on_request_start(session: ClientSession, context: SimpleNamespace, params: Any) -> None:
+        stats["requests"] += 1
+
+    async def _on_connection_create_end(session: ClientSession, context: SimpleNamespace, params: Any) -> None:
+        stats["connections_created"] += 1
+
+    async def _on_connection_reuseconn(session: ClientSession, context: SimpleNamespace, params: Any) -> None:
+        stats["connections_reused"] += 1
+
+    async def _on_dns_cache_miss(session: ClientSession, context: SimpleNamespace, params: Any) -> None:
+        stats["dns_lookups"] += 1
+
+    trace_config.on_request_start.append(_on_request_start)
+    trace_config.on_connection_create_end.append(_on_connection_create_end)
+    trace_config.on_connection_reuseconn.append(_on_connection_reuseconn)
+    trace_config.on_dns_cache_miss.append(_on_dns_cache_miss)
+    return trace_config
+
+
+@callback
+def async_get_session(hass: HomeAssistant) -> ClientSession:
+    """Return the integration's own session with a connector tuned for its two upstreams.
+
+    Connections to both hosts are kept alive between refreshes and DNS results
+    are cached, so a fleet refresh reuses a handful of connections instead of
+    doing a TCP and TLS handshake per request.
+    """
+    session: ClientSession | None = hass.data.get(DATA_SESSION)
+    if session is not None and not session.closed:
+        return session
+
+    stats = hass.data.setdefault(DATA_CONNECTION_STATS, {
+        "requests": 0, "connections_created": 0, "connections_reused": 0, "dns_lookups": 0,
+    })
+    connector = TCPConnector(
+        limit=HTTP_CONNECTION_LIMIT,
+        limit_per_host=HTTP_CONNECTION_LIMIT_PER_HOST,
+        ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+        use_dns_cache=True,
+        keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+        ssl=ssl_util.get_default_context(),
+    )
+    session = ClientSession(
+        connector=connector,
+        headers={"User-Agent": SERVER_SOFTWARE},
+        trace_configs=[_create_trace_config(stats)],
+    )
+    hass.data[DATA_SESSION] = session
+
+    async def _async_close_session(event: Event) -> None:
+        """Close the session when Home Assistant shuts down."""
+        _LOGGER.debug("Closing RDW HTTP session")
+        await session.close()
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_close_session)
+    return session
+
+
+@callback
+def async_get_parser_pool(hass: HomeAssistant) -> HtmlParserPool:
+    """Return the shared pool that parses stolen register pages off the event loop."""
+    pool: HtmlParserPool | None = hass.data.get(DATA_PARSER_POOL)
+    if pool is not None:
+        return pool
+
+    pool = hass.data[DATA_PARSER_POOL] = HtmlParserPool(STOLEN_PARSE_WORKERS, STOLEN_PARSE_MAX_PENDING)
+
+    @callback
+    def _async_shutdown_pool(event: Event) -> None:
+        """Stop the parser workers when Home Assistant shuts down."""
+        _LOGGER.debug("Shutting down RDW stolen register parser pool")
+        pool.shutdown()
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_shutdown_pool)
+    return pool
+
+
+@callback
+def async_get_connection_stats(hass: HomeAssistant) -> dict[str, int]:
+    """Return connection statistics of the dedicated session (for diagnostics)."""
+    return dict(hass.data.get(DATA_CONNECTION_STATS, {}))
+
+
+@callback
+def async_get_rate_limiter(hass: HomeAssistant, app_token: str | None) -> RdwRateLimiter:
+    """Return the rate limiter shared by all clients using this app token."""
+    limiters: dict[str | None, RdwRateLimiter] = hass.data.setdefault(DATA_RATE_LIMITERS, {})
+    if app_token not in limiters:
+        if app_token:
+            limiters[app_token] = RdwRateLimiter(API_TOKEN_MIN_INTERVAL, API_TOKEN_MAX_CONCURRENT)
+        else:
+            limiters[app_token] = RdwRateLimiter(API_ANONYMOUS_MIN_INTERVAL, API_ANONYMOUS_MAX_CONCURRENT)
+    return limiters[app_token]
+
+
+@callback
+def async_get_api_client(hass: HomeAssistant, app_token: str | None = None) -> RdwApiClient:
+    """Return an API client using the shared session and rate limiter."""
+    app_token = app_token or None
+    return RdwApiClient(
+        async_get_session(hass),
+        app_token=app_token,
+        rate_limiter=async_get_rate_limiter(hass, app_token),
+        parser_pool=async_get_parser_pool(hass),
+    )
@@ -1,8 +1,6 @@
 """Constants for the RDW Vehicle Information integration."""
 from typing import Final
 from datetime import timedelta
-import voluptuous as vol
-import homeassistant.helpers.config_validation as cv
 from homeassistant.const import Platform # Import Platform
 
 DOMAIN: Final = "rdw_vehicle_info"
@@ -11,21 +9,68 @@ MANUFACTURER: Final = "RDW (Dutch Road Authority)"
 # Configuration Keys
 CONF_LICENSE_PLATE: Final = "license_plate"
 CONF_SENSORS: Final = "sensors"
-CONF_ENABLE_IMAGE: Final = "enable_image" # Keep or remove based on your final image entity plan
+CONF_COMPACT_MODE: Final = "compact_mode" # One summary sensor per vehicle instead of one per field
+CONF_ENTRY_TYPE: Final = "entry_type"
+CONF_PLATES: Final = "plates" # Fleet entries: list of normalized license plates
+CONF_ADD_PLATES: Final = "add_plates"
+CONF_REMOVE_PLATES: Final = "remove_plates"
+
+# Config entry types
+ENTRY_TYPE_VEHICLE: Final = "vehicle"
+ENTRY_TYPE_FLEET: Final = "fleet"
 
 # API Details
 API_BASE_URL: Final = "https://opendata.rdw.nl/resource/m9d7-ebf2.json"
 API_PARAM_LICENSE_PLATE: Final = "kenteken"
 API_TIMEOUT: Final = 10 # seconds
+API_PARAM_WHERE: Final = "$where"
+API_PARAM_LIMIT: Final = "$limit"
+API_BATCH_SIZE: Final = 100 # Plates per batched fleet query, keeps the URL well below server limits
+# Recall datasets, only queried for vehicles whose open recall indicator is set
+API_RECALL_STATUS_URL: Final = "https://opendata.rdw.nl/resource/t49b-isb7.json" # Terugroep_actie_status, per plate
+API_RECALL_URL: Final = "https://opendata.rdw.nl/resource/j9yg-7rg9.json" # Terugroep_actie, per recall
+API_PARAM_RECALL_CODE: Final = "referentiecode_rdw"
+RECALL_INDICATOR_KEY: Final = "openstaande_terugroepactie_indicator"
+
+# Socrata app token and throttling
+CONF_APP_TOKEN: Final = "app_token"
+API_APP_TOKEN_HEADER: Final = "X-App-Token"
+API_QUOTA_HEADERS: Final = ("X-RateLimit-Limit", "X-RateLimit-Remaining", "X-RateLimit-Reset", "Retry-After")
+API_THROTTLED_BACKOFF: Final = 60 # seconds to pause after a 429 without Retry-After
+# Conditional requests: response validator header -> request header that echoes it
+HTTP_VALIDATOR_HEADERS: Final = {"ETag": "If-None-Match", "Last-Modified": "If-Modified-Since"}
+# Shared request pacing (seconds between requests, requests in flight)
+API_ANONYMOUS_MIN_INTERVAL: Final = 1.0
+API_ANONYMOUS_MAX_CONCURRENT: Final = 2
+API_TOKEN_MIN_INTERVAL: Final = 0.1
+API_TOKEN_MAX_CONCURRENT: Final = 8
+
+# Dedicated HTTP connector for opendata.rdw.nl and gestolenobjectenregister.nl
+HTTP_CONNECTION_LIMIT: Final = 20
+HTTP_CONNECTION_LIMIT_PER_HOST: Final = 8
+HTTP_DNS_CACHE_TTL: Final = 3600 # seconds
+HTTP_KEEPALIVE_TIMEOUT: Final = 120 # seconds, long enough to span a whole fleet refresh
 
 # Stolen Objects Register Details
 STOLEN_REGISTER_URL: Final = "https://gestolenobjectenregister.nl/registration_overview/"
 STOLEN_REGISTER_PARAM_SEARCH: Final = "df_search"
 STOLEN_REGISTER_PARAM_LANG: Final = "l" # Language param, '1' for Dutch
+# Stolen register pages are parsed off the event loop in a small dedicated pool
+STOLEN_PARSE_WORKERS: Final = 2
+STOLEN_PARSE_MAX_PENDING: Final = 8 # Pages queued for parsing before callers wait (backpressure)
 
 # Update Interval
 DEFAULT_UPDATE_INTERVAL: Final = timedelta(hours=24) # RDW data rarely changes rapidly
 
+# Fleet refresh: maximum number of stolen register checks in flight at once
+FLEET_STOLEN_CHECK_CONCURRENCY: Final = 4
+# Fleet aggregate sensors: window for the "APK expiring soon" count
+FLEET_APK_EXPIRING_DAYS: Final = 30
+# Fuzzy plate index: maximum edits (after collapsing confusable characters) for a candidate
+PLATE_INDEX_MAX_DISTANCE: Final = 1
+# Date fields parsed once per update for the derived (days until/since) sensors
+DERIVED_DATE_KEYS: Final = ("vervaldatum_apk_dt", "datum_eerste_toelating_dt", "datum_tenaamstelling_dt")
+
 # Data Keys from RDW API (Used for sensor selection and naming)
 # ... (your existing RDW_API_KEYS list remains the same) ...
 RDW_API_KEYS: Final[list[str]] = [
@@ -49,25 +94,71 @@ RDW_API_KEYS: Final[list[str]] = [
      "zuinigheidsclassificatie",
 ]
 
+# Fields whose values repeat across vehicles (makes, colours, categories, "Ja"/"Nee" flags).
+# The record store interns these so a fleet shares one copy of each value.
+RDW_CATEGORICAL_KEYS: Final[frozenset[str]] = frozenset({
+     "voertuigsoort", "merk", "handelsbenaming", "inrichting", "eerste_kleur",
+     "tweede_kleur", "europese_voertuigcategorie", "aantal_zitplaatsen",
+     "aantal_cilinders", "aantal_deuren", "aantal_wielen", "wacht_op_keuren",
+     "wam_verzekerd", "export_indicator", "openstaande_terugroepactie_indicator",
+     "taxi_indicator", "tenaamstellen_mogelijk", "tellerstandoordeel",
+     "code_toelichting_tellerstandoordeel", "jaar_laatste_registratie_tellerstand",
+     "zuinigheidsclassificatie", "type", "variant", "uitvoering",
+     "typegoedkeuringsnummer", "volgnummer_wijziging_eu_typegoedkeuring",
+})
+
 # New data key for the stolen status
 DATA_KEY_IS_STOLEN: Final = "is_stolen"
-
-# Sensor configuration schema used in config flow options
-# ... (your existing SENSOR_SCHEMA remains the same, stolen check is a separate entity) ...
-SENSOR_SCHEMA = vol.Schema({
-    vol.Optional(key, default=True): cv.boolean for key in RDW_API_KEYS
-})
+# Recall details, only present while the open recall indicator is set
+DATA_KEY_RECALLS: Final = "recalls"
 
 # Image constants
 # ... (your existing Image constants remain the same) ...
-IMAGE_PATH_LOCAL = f"/local/{DOMAIN}/brand_logos"
-IMAGE_PATH_WWW = f"/{DOMAIN}_files/brand_logos"
 DEFAULT_IMAGE_FILENAME = "default.png"
+# Pre-sized, content-hashed logo variants (built once into .storage, served immutable)
+LOGO_SIZES: Final = (64, 128, 256)
+LOGO_PICTURE_SIZE: Final = 128 # Entity picture shown in tiles and badges
+LOGO_IMAGE_SIZE: Final = 256 # Bytes returned by the image entity
+LOGO_URL: Final = f"/{DOMAIN}_logos"
+LOGO_CACHE_DIR: Final = f"{DOMAIN}_logos"
+LOGO_CACHE_MAX_AGE: Final = 31536000 # seconds (one year), safe because URLs change with content
 
 # Add binary_sensor to platforms
 PLATFORMS: Final[list[Platform]] = [Platform.SENSOR, Platform.IMAGE, Platform.BINARY_SENSOR]
 
+# Dispatcher signal sent when only the sensor selection of an entry changed (format with entry_id)
+SIGNAL_SENSORS_UPDATED: Final = f"{DOMAIN}_sensors_updated_{{}}"
+
 # Diagnostics
 DIAG_CONFIG_ENTRY: Final = "config_entry"
 DIAG_COORDINATOR_DATA: Final = "coordinator_data"
-DIAG_OPTIONS: Final = "options"
\ No newline at end of file
+DIAG_OPTIONS: Final = "options"
+DIAG_API_QUOTA: Final = "api_quota"
+DIAG_HTTP_CONNECTIONS: Final = "http_connections"
+DIAG_STOLEN_PARSER: Final = "stolen_parser"
+
+# Services
+SERVICE_SEARCH_PLATE: Final = "search_plate"
+SERVICE_LOOKUP_PLATE: Final = "lookup_plate"
+SERVICE_IMPORT_PLATES: Final = "import_plates"
+SERVICE_REFRESH_ALL: Final = "refresh_all"
+SERVICE_EXPORT_RECORDS: Final = "export_records"
+ATTR_LICENSE_PLATE: Final = "license_plate"
+ATTR_LIMIT: Final = "limit"
+ATTR_PATH: Final = "path"
+ATTR_CONCURRENCY: Final = "concurrency"
+ATTR_FORMAT: Final = "format"
+ATTR_FILENAME: Final = "filename"
+# refresh_all: plates refreshed in parallel by default, and how often progress is reported
+REFRESH_ALL_CONCURRENCY: Final = 4
+REFRESH_ALL_PROGRESS_EVERY: Final = 25 # plates
+EVENT_REFRESH_PROGRESS: Final = f"{DOMAIN}_refresh_progress"
+EVENT_REFRESH_FINISHED: Final = f"{DOMAIN}_refresh_finished"
+# export_records: supported file formats, the first one is the default, and the
+# subdirectory of the config directory exports are confined to
+EXPORT_FORMATS: Final = ("csv", "jsonl")
+EXPORT_DIR: Final = f"{DOMAIN}_exports"
+
+# Change tracking: event fired with a per-field diff, and per-plate history files in .storage
+EVENT_VEHICLE_CHANGED: Final = f"{DOMAIN}_changed"
+HISTORY_DIR: Final = f"{DOMAIN}_history"
\ No newline at end of file
@@ -1,20 +1,38 @@
 """DataUpdateCoordinator for RDW Vehicle Information."""
+import asyncio
 import logging
-from datetime import timedelta, datetime
+from datetime import date, timedelta, datetime
+from functools import partial
+from typing import TYPE_CHECKING
 
-from homeassistant.core import HomeAssistant
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.util import dt as dt_util
 
 # Import the new StolenRegisterError
-from .api import RdwApiClient, RdwApiError, RdwApiNoDataError, StolenRegisterError
+from .api import RdwApiClient, RdwApiError, RdwApiNoDataError, RdwApiNotModified, StolenRegisterError
 # Import the new data key constant
-from .const import DOMAIN, DATA_KEY_IS_STOLEN
+from .const import (
+    DOMAIN, MANUFACTURER, DATA_KEY_IS_STOLEN, DATA_KEY_RECALLS, API_BATCH_SIZE, API_PARAM_LICENSE_PLATE,
+    FLEET_STOLEN_CHECK_CONCURRENCY, RECALL_INDICATOR_KEY, EVENT_VEHICLE_CHANGED,
+)
+from .derived import parse_record_dates
+from .history import RdwChangeHistory, diff_records
+from .plate import normalize_license_plate
+from .store import RdwRecord
+
+if TYPE_CHECKING:
+    from .analytics import FleetTable
 
 _LOGGER = logging.getLogger(__name__)
 
+# Stands in for RDW data or a stolen status that a conditional request reported unchanged (304)
+NOT_MODIFIED = object()
+
 # Update the type hint to allow None and include the new key
-class RdwDataUpdateCoordinator(DataUpdateCoordinator[dict | None]):
+class RdwDataUpdateCoordinator(DataUpdateCoordinator[RdwRecord | None]):
     """Class to manage fetching RDW data."""
 
     def __init__(
@@ -23,25 +41,57 @@ class RdwDataUpdateCoordinator(DataUpdateCoordinator[dict | None]):
         name: str,
         client: RdwApiClient,
         license_plate: str,
-        update_interval: timedelta,
+        update_interval: timedelta | None,
     ):
         """Initialize the coordinator."""
         self.client = client
         self.license_plate = license_plate
+        if normalize_license_plate(license_plate) is None:
+            _LOGGER.warning("%s is not a valid Dutch license plate, it will not be looked up", license_plate)
         self._error_count = 0
         self._last_update_error = False
-        self.last_data: dict | None = None
+        self.last_data: RdwRecord | None = None
+        # Recall details, fetched once the recall indicator is set and kept until it clears
+        self.recalls: list[dict] | None = None
+        # Last record with RDW data, the base for change events and the history file
+        self._change_base: RdwRecord | None = None
+        self.history = RdwChangeHistory(hass, license_plate)
+        # Dates of the last known data, parsed once per update for the derived sensors
+        self.dates: dict[str, date] = {}
         # Keep the manual timestamp from the previous fix if you found it necessary
         self.last_update_success_timestamp: datetime | None = None
-
+        self._device_info: DeviceInfo | None = None
+        # ETag / Last-Modified of the last full responses, sent back as conditional requests
+        self._rdw_validators: dict[str, str] = {}
+        self._stolen_validators: dict[str, str] = {}
+        # Diagnostic entities: notified of update cycles that left the data unchanged
+        self._status_listeners: set[CALLBACK_TYPE] = set()
 
         super().__init__(
             hass,
             _LOGGER,
             name=name,
             update_interval=update_interval,
+            # Unchanged data (returned as the same record) does not notify entities
+            always_update=False,
         )
 
+    @callback
+    def async_add_status_listener(self, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Listen for update cycles that did not change the data.
+
+        Unchanged data does not notify coordinator listeners (always_update=False),
+        but the error state and update timestamp still change. Returns the remove callback.
+        """
+        self._status_listeners.add(update_callback)
+        return partial(self._status_listeners.discard, update_callback)
+
+    @callback
+    def _async_update_status_listeners(self) -> None:
+        """Notify the status listeners."""
+        for update_callback in list(self._status_listeners):
+            update_callback()
+
     @property
     def error_count(self) -> int:
         """Return the number of consecutive errors."""
@@ -52,7 +102,23 @@ class RdwDataUpdateCoordinator(DataUpdateCoordinator[dict | None]):
         """Return if the last update resulted in an error."""
         return self._last_update_error
 
-    async def _async_update_data(self) -> dict | None:
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return the device info shared by all entities of this plate."""
+        if self._device_info is None:
+            data = self.data or {}
+            self._device_info = DeviceInfo(
+                identifiers={(DOMAIN, self.license_plate)},
+                name=f"RDW Vehicle {self.license_plate}",
+                manufacturer=MANUFACTURER,
+                model=data.get("merk", "Unknown") + " " + data.get("handelsbenaming", ""),
+                entry_type=None, # Use None for service-provided devices
+                configuration_url="https://opendata.rdw.nl/",
+                sw_version=data.get("typegoedkeuringsnummer"), # Example using an available field
+            )
+        return self._device_info
+
+    async def _async_update_data(self) -> RdwRecord | None:
         """Fetch data from RDW API and check stolen status."""
         _LOGGER.debug("Fetching all data for RDW vehicle %s", self.license_plate)
         rdw_data = None
@@ -60,40 +126,128 @@ class RdwDataUpdateCoordinator(DataUpdateCoordinator[dict | None]):
 
         # --- 1. Fetch RDW Data ---
         try:
-            rdw_data = await self.client.get_vehicle_data(self.license_plate)
+            rdw_data = await self.client.get_vehicle_data(self.license_plate, self._rdw_validators)
             _LOGGER.debug("Successfully fetched RDW data for %s", self.license_plate)
             # Note: Error counters and timestamp handling moved below after combining data
+        except RdwApiNotModified:
+            rdw_data = NOT_MODIFIED
         except RdwApiNoDataError:
+             self._rdw_validators.clear() # The next request must not be answered with a 304 for old data
              _LOGGER.warning("No RDW data found for license plate %s, skipping other checks.", self.license_plate)
              # If no RDW data, the whole entry might be invalid, but let's still try stolen check?
              # For now, treat no RDW data as a potential issue but continue if possible
              pass # Continue to stolen check even if RDW fails
         except RdwApiError as err:
+            self._rdw_validators.clear()
             _LOGGER.error("Error fetching RDW data for %s: %s", self.license_plate, err)
             # Continue to stolen check even if RDW fails
             pass
 
+        # --- 1b. Recall details, only for vehicles with an open recall ---
+        await self.async_update_recalls(rdw_data)
+
         # --- 2. Check Stolen Status ---
         # Only check stolen status if we at least attempted to get RDW data (or always?)
         # Let's check always, as a plate might be stolen but not have RDW data anymore (e.g., exported)
+        is_stolen = await self.async_check_stolen()
+
+        data = self._process_update(rdw_data, is_stolen)
+        if data is self.data:
+            self._async_update_status_listeners()
+        return data
+
+    async def async_check_stolen(self) -> bool | None | object:
+        """Check the stolen register, returning NOT_MODIFIED if the page did not change."""
         try:
-             is_stolen = await self.client.async_check_stolen(self.license_plate)
+             is_stolen = await self.client.async_check_stolen(self.license_plate, self._stolen_validators)
              _LOGGER.debug("Successfully checked stolen status for %s: %s", self.license_plate, is_stolen)
              # is_stolen will be True, False, or None
+        except RdwApiNotModified:
+             return NOT_MODIFIED
         except StolenRegisterError as err:
              _LOGGER.error("Error checking stolen register for %s: %s", self.license_plate, err)
              is_stolen = None # Explicitly set to None on error
+        return is_stolen
 
-        # --- 3. Combine and Process Data ---
-        combined_data: dict = {}
+    async def async_update_recalls(self, rdw_data: dict | None) -> None:
+        """Fetch recall details when the recall indicator is set and none are cached yet.
 
-        # If RDW data was successfully fetched, include it
-        if rdw_data:
-            combined_data.update(rdw_data)
+        The cache is dropped as soon as the indicator clears, so request volume
+        follows the number of vehicles with an open recall, not the fleet size.
+        Unchanged RDW data is judged by the last record that held RDW data, so a
+        recall fetch that failed earlier is retried. If RDW data could not be
+        fetched, the cache is left as it is.
+        """
+        if rdw_data is NOT_MODIFIED:
+            rdw_data = self._change_base
+        if not rdw_data:
+            return
+        if rdw_data.get(RECALL_INDICATOR_KEY) != "Ja":
+            if self.recalls is not None:
+                _LOGGER.debug("Recall indicator cleared for %s, dropping recall details", self.license_plate)
+            self.recalls = None
+            return
+        if self.recalls is not None:
+            return
 
+        try:
+            self.recalls = await self.client.get_recalls(self.license_plate)
+            _LOGGER.debug("Fetched %d recall(s) for %s", len(self.recalls), self.license_plate)
+        except RdwApiError as err:
+            # Retried on the next refresh, the indicator itself is still reported
+            _LOGGER.warning("Error fetching recall details for %s: %s", self.license_plate, err)
+
+    @callback
+    def async_push_update(self, rdw_data: dict | None | object, is_stolen: bool | None | object) -> None:
+        """Process data fetched on behalf of this plate (fleet refresh) and notify entities if it changed."""
+        data = self._process_update(rdw_data, is_stolen)
+        if data is self.data and self.last_update_success:
+            # Unchanged, mirrors always_update=False for pushed data
+            self._async_update_status_listeners()
+            return
+        self.async_set_updated_data(data)
+
+    def _process_update(
+        self, rdw_data: dict | None | object, is_stolen: bool | None | object
+    ) -> RdwRecord | None:
+        """Combine RDW data and stolen status and update error tracking.
+
+        Either input may be NOT_MODIFIED. Unchanged RDW data is rebuilt from
+        the last record that held RDW data, since the last record itself may
+        only carry a stolen status (RDW unreachable). If both are unchanged and
+        the last record holds RDW data, it is returned as is.
+        """
+        if rdw_data is NOT_MODIFIED:
+            if self._change_base is None:
+                # Nothing a 304 could refer to, the next request is sent unconditionally
+                self._rdw_validators.clear()
+                rdw_data = None
+            elif (
+                is_stolen is NOT_MODIFIED
+                and self.last_data is not None and API_PARAM_LICENSE_PLATE in self.last_data
+            ):
+                _LOGGER.debug("RDW data and stolen status not modified for %s", self.license_plate)
+                self._error_count = 0
+                self._last_update_error = False
+                self.last_update_success_timestamp = dt_util.now()
+                return self.last_data
+            else:
+                rdw_data = {
+                    key: value for key, value in self._change_base.items()
+                    if key not in (DATA_KEY_IS_STOLEN, DATA_KEY_RECALLS)
+                }
+        if is_stolen is NOT_MODIFIED:
+            is_stolen = self.last_data.get(DATA_KEY_IS_STOLEN) if self.last_data is not None else None
+
+        # --- 3. Combine and Process Data ---
+        # If RDW data was successfully fetched, include it
         # Add the stolen status result
         # is_stolen can be True, False, or None (if check failed)
-        combined_data[DATA_KEY_IS_STOLEN] = is_stolen
+        # Stored as a compact record: shared field layout, interned categorical values
+        combined = {**(rdw_data or {}), DATA_KEY_IS_STOLEN: is_stolen}
+        if self.recalls is not None:
+            combined[DATA_KEY_RECALLS] = self.recalls
+        combined_data = RdwRecord.from_mapping(combined)
 
         # Check if *any* data was obtained (either RDW or stolen status, or both failed)
         # Decide if you want to consider the update successful if *only* the stolen check succeeded
@@ -110,9 +264,6 @@ class RdwDataUpdateCoordinator(DataUpdateCoordinator[dict | None]):
             self.last_update_success_timestamp = dt_util.now()
             return self.last_data # Return the old data to signal no change
 
-        # If combined data has changed, store the new data
-        self.last_data = combined_data
-
         # Determine if the overall update cycle was successful for timestamp/error tracking
         # Let's consider it successful if we got at least RDW data OR a stolen check result (True/False)
         # If is_stolen is None, the stolen check failed.
@@ -120,10 +271,15 @@ class RdwDataUpdateCoordinator(DataUpdateCoordinator[dict | None]):
 
 
         if update_successful:
+            # Only a successful update replaces the last known data
+            self.last_data = combined_data
+            self.dates = parse_record_dates(combined_data)
             self._error_count = 0 # Reset error count on success
             self._last_update_error = False
             self.last_update_success_timestamp = dt_util.now() # Update timestamp on success
             _LOGGER.debug("Combined data updated successfully for %s", self.license_plate)
+            if rdw_data:
+                self._track_changes(combined_data)
             return combined_data
         else:
              # If both RDW fetch failed AND stolen check failed or returned None
@@ -138,4 +294,145 @@ class RdwDataUpdateCoordinator(DataUpdateCoordinator[dict | None]):
                  return self.last_data
             else:
                  _LOGGER.debug("No last known combined data available, returning None due to overall error for %s", self.license_plate)
-                 return None # Return None if no data was ever successfully fetched
\ No newline at end of file
+                 return None # Return None if no data was ever successfully fetched
+
+
+    def _track_changes(self, record: RdwRecord) -> None:
+        """Fire a change event and append to the history when fields changed.
+
+        Records without RDW data (RDW unreachable) are skipped, so an outage
+        is not reported as every field being removed and added again. Likewise
+        a failed stolen check (None) keeps the last known stolen status.
+        """
+        previous = self._change_base
+        if previous is not None and record.get(DATA_KEY_IS_STOLEN) is None:
+            record = RdwRecord.from_mapping({**record, DATA_KEY_IS_STOLEN: previous.get(DATA_KEY_IS_STOLEN)})
+        self._change_base = record
+        if previous is None:
+            # First record of this run: write a snapshot to resync the delta chain
+            self.history.async_record_snapshot(record)
+            return
+
+        changes = diff_records(previous, record)
+        if not changes:
+            return
+        _LOGGER.debug("Fields changed for %s: %s", self.license_plate, list(changes))
+        self.history.async_record_changes(changes, record)
+        self.hass.bus.async_fire(
+            EVENT_VEHICLE_CHANGED, {"license_plate": self.license_plate, "changes": changes}
+        )
+
+
+class RdwFleetCoordinator(DataUpdateCoordinator[dict[str, RdwRecord | None]]):
+    """Refresh all plates of a fleet entry together.
+
+    Each plate keeps its own (timer-less) RdwDataUpdateCoordinator so entities
+    work unchanged; this coordinator fetches RDW data in batched requests and
+    pushes every plate's result to its coordinator. A columnar FleetTable
+    mirrors the plates' records for the fleet aggregate sensors.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        name: str,
+        client: RdwApiClient,
+        license_plates: list[str],
+        update_interval: timedelta,
+    ):
+        """Initialize the fleet coordinator and one plate coordinator per plate."""
+        self.client = client
+        self.coordinators: dict[str, RdwDataUpdateCoordinator] = {
+            plate: RdwDataUpdateCoordinator(
+                hass=hass,
+                name=f"RDW Coordinator {plate}",
+                client=client,
+                license_plate=plate,
+                update_interval=None, # Driven by the fleet refresh
+            )
+            for plate in license_plates
+        }
+        # Validators of each batched query, keyed by the plates in the batch
+        self._batch_validators: dict[tuple[str, ...], dict[str, str]] = {}
+        # Plates each batch's last full response held a row for; a 304 only vouches for those
+        self._batch_plates: dict[tuple[str, ...], frozenset[str]] = {}
+        # Imported here so numpy is only loaded once a fleet is set up, not for single vehicles
+        from . import analytics
+
+        self.table: "FleetTable" = analytics.FleetTable(self.coordinators)
+        # Keep each plate's table row current whenever its coordinator gets new data
+        for plate, coordinator in self.coordinators.items():
+            coordinator.async_add_listener(partial(self._async_update_table_row, plate))
+
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=name,
+            update_interval=update_interval,
+            always_update=False,
+        )
+
+    @callback
+    def _async_update_table_row(self, plate: str) -> None:
+        """Copy the latest record of one plate into the fleet table."""
+        self.table.update(plate, self.coordinators[plate].data)
+
+    async def _async_update_data(self) -> dict[str, RdwRecord | None]:
+        """Stream RDW data in batches and hand each row to its plate right away."""
+        plates = list(self.coordinators)
+        _LOGGER.debug("Fetching RDW data for fleet %s (%d plates)", self.name, len(plates))
+
+        # Stolen register checks run with bounded concurrency, the register has no batch lookup
+        semaphore = asyncio.Semaphore(FLEET_STOLEN_CHECK_CONCURRENCY)
+
+        async def _async_finish_plate(plate: str, rdw_data: dict | None | object) -> None:
+            """Fetch recall details if needed, check stolen status and push combined data for one plate."""
+            coordinator = self.coordinators[plate]
+            async with semaphore:
+                await coordinator.async_update_recalls(rdw_data)
+                is_stolen = await coordinator.async_check_stolen()
+            coordinator.async_push_update(rdw_data, is_stolen)
+
+        # --- 1. Stream RDW rows; each row is dispatched as soon as it is decoded ---
+        pending = set(plates)
+        tasks: list[asyncio.Task] = []
+        for start in range(0, len(plates), API_BATCH_SIZE):
+            batch = plates[start:start + API_BATCH_SIZE]
+            batch_key = tuple(batch)
+            validators = self._batch_validators.setdefault(batch_key, {})
+            returned: set[str] = set()
+            try:
+                async for row in self.client.iter_vehicles_data(batch, validators):
+                    plate = row[API_PARAM_LICENSE_PLATE]
+                    if plate in pending:
+                        returned.add(plate)
+                        pending.discard(plate)
+                        tasks.append(asyncio.create_task(_async_finish_plate(plate, row)))
+                self._batch_plates[batch_key] = frozenset(returned)
+            except RdwApiNotModified:
+                # Nothing in this batch changed: no body to decode, the plates keep their records.
+                # Plates the cached response had no row for stay pending and get None, so a 304
+                # never brings back data RDW stopped returning.
+                for plate in self._batch_plates.get(batch_key, frozenset()):
+                    if plate in pending:
+                        pending.discard(plate)
+                        tasks.append(asyncio.create_task(_async_finish_plate(plate, NOT_MODIFIED)))
+            except RdwApiError as err:
+                # Plates of a failed batch may have lost their data, the next request is sent unconditionally
+                validators.clear()
+                self._batch_plates.pop(batch_key, None)
+                _LOGGER.error("Error fetching RDW data for %d plates of fleet %s: %s", len(batch), self.name, err)
+
+        # --- 2. Plates without an RDW row still get their stolen check ---
+        tasks.extend(asyncio.create_task(_async_finish_plate(plate, None)) for plate in pending)
+        await asyncio.gather(*tasks)
+
+        return {plate: coordinator.data for plate, coordinator in self.coordinators.items()}
+
+
+def get_entry_coordinators(hass: HomeAssistant, entry: ConfigEntry) -> list[RdwDataUpdateCoordinator]:
+    """Return the plate coordinators that belong to a config entry."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    if isinstance(coordinator, RdwFleetCoordinator):
+        return list(coordinator.coordinators.values())
+    return [coordinator]
@@ -0,0 +1,73 @@
+"""Date parsing and the shared midnight tick behind the derived RDW sensors."""
+from collections.abc import Mapping
+from datetime import date, datetime
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_change
+from homeassistant.util.dt import parse_datetime
+
+from .const import DOMAIN, DERIVED_DATE_KEYS
+
+# Subscribers of the midnight tick and the cancel callback of its single timer
+DATA_MIDNIGHT_TICK = f"{DOMAIN}_midnight_tick"
+
+
+def parse_rdw_date(value: str) -> date | str:
+    """Parse an RDW date string, returning the original string if it cannot be parsed."""
+    # RDW provides dates like 'YYYYMMDD' or 'YYYY-MM-DDTHH:mm:ss.sss'
+    parsed_value = parse_datetime(value) # Try parsing ISO format first
+    if parsed_value:
+        return parsed_value.date()
+    # Try parsing YYYYMMDD if ISO fails
+    if len(value) == 8 and value.isdigit():
+        try:
+            return date(int(value[0:4]), int(value[4:6]), int(value[6:8]))
+        except ValueError:
+            return value # Return original if format is unexpected
+    return value # Return original string if parsing fails
+
+
+def parse_record_dates(record: Mapping[str, Any] | None) -> dict[str, date]:
+    """Parse the date fields the derived sensors need, once per record."""
+    dates: dict[str, date] = {}
+    for key in DERIVED_DATE_KEYS:
+        value = (record or {}).get(key)
+        if isinstance(value, str) and isinstance(parsed := parse_rdw_date(value), date):
+            dates[key] = parsed
+    return dates
+
+
+@callback
+def async_track_midnight(hass: HomeAssistant, action: CALLBACK_TYPE) -> CALLBACK_TYPE:
+    """Call action at local midnight, sharing one timer between all subscribers.
+
+    The timer is started by the first subscriber and cancelled when the last
+    one unsubscribes. Returns the unsubscribe callback.
+    """
+    tick = hass.data.get(DATA_MIDNIGHT_TICK)
+    if tick is None:
+        subscribers: set[CALLBACK_TYPE] = set()
+
+        @callback
+        def _async_midnight(now: datetime) -> None:
+            """Notify every subscriber."""
+            for subscriber in list(subscribers):
+                subscriber()
+
+        tick = hass.data[DATA_MIDNIGHT_TICK] = (
+            subscribers,
+            async_track_time_change(hass, _async_midnight, hour=0, minute=0, second=0),
+        )
+
+    subscribers, _ = tick
+    subscribers.add(action)
+
+    @callback
+    def _async_unsubscribe() -> None:
+        """Remove the subscriber and stop the timer once nobody listens."""
+        subscribers.discard(action)
+        if not subscribers and hass.data.get(DATA_MIDNIGHT_TICK) is tick:
+            hass.data.pop(DATA_MIDNIGHT_TICK)[1]()
+
+    return _async_unsubscribe
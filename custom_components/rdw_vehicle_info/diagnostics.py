@@ -1,38 +1,68 @@
 """Diagnostics support for RDW Vehicle Information."""
 from typing import Any
 
+from homeassistant.components.diagnostics import async_redact_data
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.device_registry import DeviceEntry # Not strictly needed but good practice
 
-from .const import DOMAIN, DIAG_CONFIG_ENTRY, DIAG_COORDINATOR_DATA, DIAG_OPTIONS
-from .coordinator import RdwDataUpdateCoordinator
+from .connection import async_get_connection_stats
+from .const import (
+    DOMAIN, CONF_APP_TOKEN, DIAG_CONFIG_ENTRY, DIAG_COORDINATOR_DATA, DIAG_OPTIONS, DIAG_API_QUOTA,
+    DIAG_HTTP_CONNECTIONS, DIAG_STOLEN_PARSER,
+)
+from .coordinator import RdwDataUpdateCoordinator, RdwFleetCoordinator
+
+TO_REDACT = {CONF_APP_TOKEN}
+
+
+def _coordinator_diagnostics(coordinator: RdwDataUpdateCoordinator) -> dict[str, Any]:
+    """Return diagnostics for a single plate coordinator."""
+    return {
+        "license_plate": coordinator.license_plate,
+        "last_update_success": coordinator.last_update_success,
+        "last_update_error": coordinator.last_update_error,
+        "last_update_timestamp": coordinator.last_update_success_timestamp.isoformat() if coordinator.last_update_success_timestamp else None,
+        "update_interval": coordinator.update_interval.total_seconds() if coordinator.update_interval else None,
+        "consecutive_errors": coordinator.error_count,
+        "data": dict(coordinator.data) if coordinator.data is not None else None, # Include the last fetched data
+    }
 
 
 async def async_get_config_entry_diagnostics(
     hass: HomeAssistant, entry: ConfigEntry
 ) -> dict[str, Any]:
     """Return diagnostics for a config entry."""
-    coordinator: RdwDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    coordinator: RdwDataUpdateCoordinator | RdwFleetCoordinator = hass.data[DOMAIN][entry.entry_id]
+
+    if isinstance(coordinator, RdwFleetCoordinator):
+        coordinator_data = {
+            "last_update_success": coordinator.last_update_success,
+            "update_interval": coordinator.update_interval.total_seconds() if coordinator.update_interval else None,
+            "plates": {
+                plate: _coordinator_diagnostics(plate_coordinator)
+                for plate, plate_coordinator in coordinator.coordinators.items()
+            },
+        }
+    else:
+        coordinator_data = _coordinator_diagnostics(coordinator)
 
     diagnostics_data = {
         DIAG_CONFIG_ENTRY: {
              "entry_id": entry.entry_id,
              "title": entry.title,
              "data": dict(entry.data), # Make serializable copy
-             "options": dict(entry.options), # Make serializable copy
+             "options": async_redact_data(entry.options, TO_REDACT), # Make serializable copy
              "unique_id": entry.unique_id,
         },
-        DIAG_OPTIONS: dict(entry.options), # Explicitly include options again for clarity
-        DIAG_COORDINATOR_DATA: {
-            "license_plate": coordinator.license_plate,
-            "last_update_success": coordinator.last_update_success,
-            "last_update_error": coordinator.last_update_error,
-            "last_update_timestamp": coordinator.last_update_success_timestamp.isoformat() if coordinator.last_update_success_timestamp else None,
-            "update_interval": coordinator.update_interval.total_seconds() if coordinator.update_interval else None,
-            "consecutive_errors": coordinator.error_count,
-            "data": coordinator.data, # Include the last fetched data
-        }
+        DIAG_OPTIONS: async_redact_data(entry.options, TO_REDACT), # Explicitly include options again for clarity
+        DIAG_COORDINATOR_DATA: coordinator_data,
+        # Request pacing and Socrata quota headers, shared by all entries using the same token
+        DIAG_API_QUOTA: coordinator.client.rate_limiter.as_dict(),
+        # New connections vs. reused keep-alive connections of the dedicated session
+        DIAG_HTTP_CONNECTIONS: async_get_connection_stats(hass),
+        # Stolen register pages parsed in the worker pool, and how often callers had to wait
+        DIAG_STOLEN_PARSER: coordinator.client.parser_pool.as_dict() if coordinator.client.parser_pool else None,
     }
 
     return diagnostics_data
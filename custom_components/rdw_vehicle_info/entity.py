@@ -1,8 +1,6 @@
 """Base entity for RDW Vehicle Information."""
-from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN, MANUFACTURER, CONF_LICENSE_PLATE
 from .coordinator import RdwDataUpdateCoordinator
 
 
@@ -20,17 +18,8 @@ class RdwEntity(CoordinatorEntity[RdwDataUpdateCoordinator]):
         # Unique ID uses license plate and data key
         self._attr_unique_id = f"{self._license_plate}_{self.data_key}".lower()
 
-        # Link all sensors for this license plate to one device
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, self._license_plate)},
-            name=f"RDW Vehicle {self._license_plate}",
-            manufacturer=MANUFACTURER,
-            model=coordinator.data.get("merk", "Unknown") + " " + coordinator.data.get("handelsbenaming", ""),
-            entry_type=None, # Use None for service-provided devices
-            configuration_url="https://opendata.rdw.nl/",
-            sw_version=coordinator.data.get("typegoedkeuringsnummer"), # Example using an available field
-            # hw_version can be added if relevant data exists
-        )
+        # Link all sensors for this license plate to one device (shared, built once per plate)
+        self._attr_device_info = coordinator.device_info
 
     @property
     def available(self) -> bool:
@@ -0,0 +1,94 @@
+"""Field-level change tracking and append-only change history for RDW vehicles."""
+import json
+import logging
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import STORAGE_DIR
+from homeassistant.util import dt as dt_util
+
+from .const import HISTORY_DIR
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def diff_records(old: Mapping[str, Any], new: Mapping[str, Any]) -> dict[str, dict[str, Any]]:
+    """Return the fields that differ between two records as {field: {"old": ..., "new": ...}}.
+
+    Fields missing from one side are reported with None on that side.
+    """
+    changes = {
+        field: {"old": old.get(field), "new": value}
+        for field, value in new.items()
+        if field not in old or old[field] != value
+    }
+    changes.update(
+        (field, {"old": value, "new": None})
+        for field, value in old.items()
+        if field not in new
+    )
+    return changes
+
+
+class RdwChangeHistory:
+    """Append-only, delta-encoded history file of one plate.
+
+    Each line is a JSON object. The first line written in a run is a full
+    snapshot ({"time", "snapshot"}); later lines only carry the fields that
+    were set ({"time", "set"}) or removed ({"time", "unset"}). Replaying the
+    lines in order rebuilds the record at any point in time.
+    """
+
+    def __init__(self, hass: HomeAssistant, license_plate: str) -> None:
+        """Initialize the history of one plate."""
+        self.hass = hass
+        self.license_plate = license_plate
+        self.path = Path(hass.config.path(STORAGE_DIR, HISTORY_DIR, f"{license_plate.lower()}.jsonl"))
+        self._pending: list[str] = []
+        self._writing = False
+
+    @callback
+    def async_record_snapshot(self, record: Mapping[str, Any]) -> None:
+        """Queue a full snapshot of the record."""
+        self._async_queue({"time": dt_util.utcnow().isoformat(), "snapshot": dict(record)})
+
+    @callback
+    def async_record_changes(self, changes: Mapping[str, Mapping[str, Any]], new: Mapping[str, Any]) -> None:
+        """Queue the delta produced by diff_records."""
+        entry: dict[str, Any] = {"time": dt_util.utcnow().isoformat()}
+        set_fields = {field: change["new"] for field, change in changes.items() if field in new}
+        unset_fields = [field for field in changes if field not in new]
+        if set_fields:
+            entry["set"] = set_fields
+        if unset_fields:
+            entry["unset"] = unset_fields
+        self._async_queue(entry)
+
+    @callback
+    def _async_queue(self, entry: dict[str, Any]) -> None:
+        """Queue one line and start a writer if none is running, keeping lines in order."""
+        self._pending.append(json.dumps(entry, ensure_ascii=False, separators=(",", ":")))
+        if not self._writing:
+            self._writing = True
+            self.hass.async_create_background_task(
+                self._async_flush(), f"RDW change history {self.license_plate}"
+            )
+
+    async def _async_flush(self) -> None:
+        """Write queued lines in the executor until the queue is empty."""
+        try:
+            while self._pending:
+                lines, self._pending = self._pending, []
+                await self.hass.async_add_executor_job(self._append, lines)
+        except OSError as err:
+            _LOGGER.error("Error writing change history for %s to %s: %s", self.license_plate, self.path, err)
+        finally:
+            self._writing = False
+
+    def _append(self, lines: list[str]) -> None:
+        """Append lines to the history file (runs in the executor)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a", encoding="utf-8") as file:
+            file.write("".join(f"{line}\n" for line in lines))
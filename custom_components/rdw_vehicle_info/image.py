@@ -1,23 +1,31 @@
 """Image platform for RDW Vehicle Information."""
 import logging
-from typing import cast
-import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any
 
 from homeassistant.components.image import ImageEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
 
 from .const import (
-    DOMAIN,
-    CONF_ENABLE_IMAGE,
+    CONF_COMPACT_MODE,
     CONF_SENSORS, # Needed to check if 'merk' is enabled
-    IMAGE_PATH_WWW,
     DEFAULT_IMAGE_FILENAME,
+    DOMAIN,
+    LOGO_SIZES,
+    LOGO_PICTURE_SIZE,
+    LOGO_IMAGE_SIZE,
+    SIGNAL_SENSORS_UPDATED,
 )
-from .coordinator import RdwDataUpdateCoordinator
+from .coordinator import RdwDataUpdateCoordinator, get_entry_coordinators
 from .entity import RdwEntity
+from .logos import LogoCache, async_get_logo_cache
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -28,147 +36,178 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the RDW image platform."""
-    # Check if image entity is enabled in options
-    if not entry.options.get(CONF_ENABLE_IMAGE, False):
-        _LOGGER.debug("RDW Image entity disabled via options for %s", entry.entry_id)
+    coordinators = get_entry_coordinators(hass, entry)
+    if entry.options.get(CONF_COMPACT_MODE, False):
+        # Compact mode keeps large fleets at a few entities per vehicle, so no logo images either
+        _LOGGER.debug("Not adding RDW image entities for %s (compact mode)", entry.title)
+        _async_remove_images(hass, coordinators)
         return
+    image_enabled = False
 
-    # Check if the 'merk' sensor is enabled, as we need it for the image
-    enabled_sensors = entry.options.get(CONF_SENSORS, {})
-    if not enabled_sensors.get("merk", False):
-         _LOGGER.warning(
-             "Cannot add RDW Image entity for %s because the 'merk' sensor is disabled in options. Enable 'merk' to show the image.",
-             entry.entry_id
+    async def _async_add_images() -> None:
+        """Add the image entities once the shared logo variants are available."""
+        # Pre-sized logo variants are built once (shared by all entries) from the packaged www path
+        try:
+            logo_cache = await async_get_logo_cache(hass)
+        except OSError as err:
+            _LOGGER.warning("Could not prepare RDW brand logos: %s. Cannot provide images.", err)
+            return
+        if not logo_cache.variants:
+            _LOGGER.warning("No RDW brand logos found in %s. Cannot provide images.", logo_cache.source_dir)
+            # Don't add the entity if the logo directory is missing or empty
+            return
+        async_add_entities(RdwVehicleImage(coordinator, logo_cache) for coordinator in coordinators)
+
+    @callback
+    def _async_update_image_selection() -> None:
+        """Add or remove the image entities when the 'merk' sensor is toggled in place."""
+        nonlocal image_enabled
+        enabled = _merk_enabled(entry)
+        if enabled == image_enabled:
+            return
+        image_enabled = enabled
+        if enabled:
+            entry.async_create_background_task(hass, _async_add_images(), "rdw_vehicle_info image setup")
+        else:
+            _async_remove_images(hass, coordinators)
+
+    # The image needs the 'merk' sensor (all sensors are enabled by default)
+    if _merk_enabled(entry):
+        image_enabled = True
+        await _async_add_images()
+    else:
+        _LOGGER.warning(
+            "Cannot add RDW Image entity for %s because the 'merk' sensor is disabled in options. Enable 'merk' to show the image.",
+            entry.entry_id
         )
-         return
 
+    entry.async_on_unload(
+        async_dispatcher_connect(hass, SIGNAL_SENSORS_UPDATED.format(entry.entry_id), _async_update_image_selection)
+    )
 
-    coordinator: RdwDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
 
-    # Check if www path exists (where logos should be)
-    # Note: This checks the packaged www path, not /local/
-    logo_dir = hass.config.path(f"custom_components/{DOMAIN}/www/brand_logos")
-    if not await hass.async_add_executor_job(os.path.isdir, logo_dir):
-         _LOGGER.warning("RDW brand_logos directory not found at %s. Cannot provide images.", logo_dir)
-         # Don't add the entity if the logo directory is missing
-         # Alternatively, could add it but have it show unavailable/error state.
-         return
+@callback
+def _async_remove_images(hass: HomeAssistant, coordinators: list[RdwDataUpdateCoordinator]) -> None:
+    """Remove the image entities of the given plates."""
+    entity_registry = er.async_get(hass)
+    for coordinator in coordinators:
+        entity_id = entity_registry.async_get_entity_id(
+            "image", DOMAIN, f"{coordinator.license_plate}_vehicle_image".lower()
+        )
+        if entity_id is not None:
+            # Removing the registry entry also removes the entity from the state machine
+            entity_registry.async_remove(entity_id)
 
 
-    async_add_entities([RdwVehicleImage(coordinator)])
+def _merk_enabled(entry: ConfigEntry) -> bool:
+    """Return whether the 'merk' sensor the image is based on is enabled in the entry options."""
+    enabled_sensors = entry.options.get(CONF_SENSORS)
+    return enabled_sensors is None or enabled_sensors.get("merk", False)
 
 
 class RdwVehicleImage(RdwEntity, ImageEntity):
-    """Representation of an RDW Vehicle Image Entity."""
+    """Representation of an RDW Vehicle Image Entity.
+
+    Logos come from the shared LogoCache: the entity picture points straight
+    at an immutable, content-hashed variant, so dashboards load it from the
+    browser cache instead of through the (token-rotating) image proxy.
+    """
 
     _attr_content_type = "image/png" # Assuming PNG logos
 
-    def __init__(self, coordinator: RdwDataUpdateCoordinator) -> None:
+    def __init__(self, coordinator: RdwDataUpdateCoordinator, logo_cache: LogoCache) -> None:
         """Initialize the image entity."""
         # Use a fixed key for the image entity type
         super().__init__(coordinator, data_key="vehicle_image")
         ImageEntity.__init__(self, coordinator.hass) # Pass hass to ImageEntity
 
         self._attr_name = "Vehicle Image" # Override name generation
-        self._logo_base_path = f"custom_components/{DOMAIN}/www/brand_logos"
-        self._image_url_base = IMAGE_PATH_WWW # Use the registered static path URL base
-        self._current_image_url = None
-        self._image_last_updated = None # Store timestamp of last successful image load
-
-        # Set initial image URL based on coordinator data if available
-        self._update_image_url()
+        self._logo_cache = logo_cache
+        self._brand_key: str | None = None
+        self._image_last_updated: datetime | None = None # Changes whenever the selected logo changes
 
+        # Set initial logo based on coordinator data if available
+        self._update_logo()
 
-    def _get_logo_filename(self) -> str:
-        """Determine the logo filename based on the vehicle brand."""
+    def _get_logo_key(self) -> str:
+        """Determine the logo (brand) to show, falling back to the default logo."""
+        default_key = Path(DEFAULT_IMAGE_FILENAME).stem
         if not self.coordinator.data or "merk" not in self.coordinator.data:
-            return DEFAULT_IMAGE_FILENAME
+            return default_key
 
         brand = str(self.coordinator.data["merk"]).lower().strip()
-        potential_filename = f"{brand}.png"
-
-        # Check if the specific brand logo exists in the www directory
-        logo_path = self.hass.config.path(self._logo_base_path, potential_filename)
-
-        if os.path.exists(logo_path): # Use os.path.exists directly
-            return potential_filename
-        else:
-            _LOGGER.debug("Logo for brand '%s' not found at %s, using default.", brand, logo_path)
-            return DEFAULT_IMAGE_FILENAME
-
-    def _update_image_url(self) -> None:
-         """Update the internal image URL attribute."""
-         filename = self._get_logo_filename()
-         self._current_image_url = f"{self._image_url_base}/{filename}"
-         _LOGGER.debug("Setting image URL for %s to %s", self.unique_id, self._current_image_url)
-
+        # Lookup in the in-memory variant table, no file system access
+        if self._logo_cache.filename(brand, LOGO_IMAGE_SIZE) is not None:
+            return brand
+        _LOGGER.debug("Logo for brand '%s' not found, using default.", brand)
+        return default_key
+
+    def _update_logo(self) -> None:
+        """Select the logo for the current data, bumping image_last_updated when it changes."""
+        brand_key = self._get_logo_key()
+        if brand_key != self._brand_key:
+            self._brand_key = brand_key
+            self._image_last_updated = dt_util.utcnow()
+            _LOGGER.debug("Setting logo for %s to %s", self.unique_id, brand_key)
+
+    def _logo_filename(self, size: int) -> str | None:
+        """Return the variant of the selected logo in the given size."""
+        return self._logo_cache.filename(self._brand_key or "", size)
 
     @property
     def image_url(self) -> str | None:
         """Return the URL of the image."""
-        # Update the URL whenever this property is accessed,
-        # ensuring it reflects the latest coordinator data.
-        # This is simpler than using async_coordinator_update listener for this case.
-        self._update_image_url()
-        return self._current_image_url
+        filename = self._logo_filename(LOGO_IMAGE_SIZE)
+        return self._logo_cache.url(filename) if filename else None
+
+    @property
+    def entity_picture(self) -> str | None:
+        """Return the cacheable URL of the small logo variant."""
+        filename = self._logo_filename(LOGO_PICTURE_SIZE)
+        return self._logo_cache.url(filename) if filename else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the URLs of every logo size, for dashboards that pick their own."""
+        return {
+            f"logo_{size}": self._logo_cache.url(filename)
+            for size in LOGO_SIZES
+            if (filename := self._logo_filename(size))
+        }
 
     async def async_image(self) -> bytes | None:
         """Return bytes of image."""
-        # This method fetches the image data directly.
-        # Useful if image_url isn't directly usable or needs authentication (not needed here).
-        filename = self._get_logo_filename()
-        logo_path = self.hass.config.path(self._logo_base_path, filename)
-
-        _LOGGER.debug("Loading image bytes from path: %s", logo_path)
+        filename = self._logo_filename(LOGO_IMAGE_SIZE)
+        if filename is None:
+            return None
 
+        _LOGGER.debug("Loading image bytes for variant: %s", filename)
         try:
-            # Run blocking I/O in executor
-            image_bytes = await self.hass.async_add_executor_job(self._load_image_bytes, logo_path)
-            self._image_last_updated = self.hass.datetime.utcnow()
-            return image_bytes
-        except FileNotFoundError:
-            _LOGGER.error("Image file not found at: %s", logo_path)
-            # Check if default exists, otherwise return None
-            default_path = self.hass.config.path(self._logo_base_path, DEFAULT_IMAGE_FILENAME)
-            if os.path.exists(default_path):
-                 try:
-                    return await self.hass.async_add_executor_job(self._load_image_bytes, default_path)
-                 except Exception as e:
-                    _LOGGER.error("Error loading default image %s: %s", default_path, e)
-                    return None
-            return None # Return None if file not found
-        except Exception as e:
-            _LOGGER.error("Error loading image from %s: %s", logo_path, e)
+            # Read once in the executor, then served from memory
+            return await self.hass.async_add_executor_job(self._logo_cache.read, filename)
+        except OSError as e:
+            _LOGGER.error("Error loading image %s: %s", filename, e)
             raise HomeAssistantError(f"Error loading image: {e}") from e
 
-    def _load_image_bytes(self, path: str) -> bytes:
-        """Load image bytes from path (blocking function)."""
-        with open(path, "rb") as f:
-            return f.read()
-
     @property
-    def image_last_updated(self):
-        """Return the timestamp when the image was last loaded."""
-        # Return the timestamp of the last successful fetch via async_image
+    def image_last_updated(self) -> datetime | None:
+        """Return the timestamp when the selected logo last changed."""
         return self._image_last_updated
 
-    # Ensure image entity updates when coordinator data changes
-    async def async_added_to_hass(self) -> None:
-        """When entity is added to hass."""
-        await super().async_added_to_hass()
-        self._update_image_url() # Set initial URL
-
+    @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
-        self._update_image_url() # Update image URL based on new data
+        self._update_logo() # Select the logo based on new data
         self.async_write_ha_state()
 
 
     @property
     def available(self) -> bool:
         """Return True if coordinator is available and 'merk' data exists (needed for image selection)."""
-        # Also check if CONF_ENABLE_IMAGE is true in options.
-        options_enabled = self.coordinator.config_entry.options.get(CONF_ENABLE_IMAGE, False)
-        merk_available = super().available and self.coordinator.data is not None and "merk" in self.coordinator.data
-        return options_enabled and merk_available
+        # Not RdwEntity.available: the image has no data key of its own
+        return (
+            self.coordinator.last_update_success
+            and self.coordinator.data is not None
+            and "merk" in self.coordinator.data
+        )
 
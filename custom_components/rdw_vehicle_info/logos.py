@@ -0,0 +1,149 @@
+"""Content-hashed, pre-sized brand logo variants served with immutable cache headers."""
+import asyncio
+import hashlib
+import io
+import logging
+import os
+from pathlib import Path
+from urllib.parse import quote
+
+from aiohttp import web
+
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import STORAGE_DIR
+
+from .const import DOMAIN, LOGO_SIZES, LOGO_URL, LOGO_CACHE_DIR, LOGO_CACHE_MAX_AGE
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_LOGO_CACHE = f"{DOMAIN}_logo_cache"
+
+
+class LogoCache:
+    """Brand logo variants, built once and looked up without any I/O afterwards.
+
+    Every source PNG is resized to each of LOGO_SIZES and written as
+    <brand>.<content hash>.<size>.png. The hash changes whenever the source
+    changes, so a variant URL never serves different content and browsers can
+    cache it forever.
+    """
+
+    def __init__(self, source_dir: Path, cache_dir: Path) -> None:
+        """Initialize an empty cache."""
+        self.source_dir = source_dir
+        self.cache_dir = cache_dir
+        self.variants: dict[str, dict[int, str]] = {}
+        self._filenames: frozenset[str] = frozenset()
+        self._bytes: dict[str, bytes] = {}
+
+    def build(self) -> None:
+        """Write missing variants and remove outdated ones (runs in the executor)."""
+        try:
+            from PIL import Image # Imported here so Pillow is only loaded while building
+        except ImportError:
+            Image = None
+            _LOGGER.warning("Pillow is not available, brand logos are served at their original size")
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        variants: dict[str, dict[int, str]] = {}
+        for source in sorted(self.source_dir.glob("*.png")):
+            data = source.read_bytes()
+            digest = hashlib.sha256(data).hexdigest()[:12]
+            brand = source.stem.lower()
+            variants[brand] = {}
+            for size in LOGO_SIZES:
+                filename = f"{brand}.{digest}.{size}.png"
+                target = self.cache_dir / filename
+                if not target.exists():
+                    # Written aside and renamed into place, so the view never serves a partial file
+                    partial = target.with_name(f"{filename}.tmp")
+                    partial.write_bytes(_resize(Image, data, size) if Image else data)
+                    os.replace(partial, target)
+                variants[brand][size] = filename
+
+        current = {filename for sizes in variants.values() for filename in sizes.values()}
+        for stale in self.cache_dir.glob("*.png"):
+            if stale.name not in current:
+                stale.unlink(missing_ok=True)
+        # Left behind by a build that was interrupted
+        for partial in self.cache_dir.glob("*.tmp"):
+            partial.unlink(missing_ok=True)
+        self.variants = variants
+        self._filenames = frozenset(current)
+        self._bytes.clear()
+        _LOGGER.debug("Prepared %d brand logos in %d sizes", len(variants), len(LOGO_SIZES))
+
+    def filename(self, brand: str, size: int) -> str | None:
+        """Return the variant filename of a brand, None if there is no logo for it."""
+        sizes = self.variants.get(brand.lower().strip())
+        return sizes[size] if sizes else None
+
+    def url(self, filename: str) -> str:
+        """Return the URL a variant is served at (brand names may contain spaces)."""
+        return f"{LOGO_URL}/{quote(filename)}"
+
+    def is_variant(self, filename: str) -> bool:
+        """Return True if filename is a current variant (guards the view against other paths)."""
+        return filename in self._filenames
+
+    def read(self, filename: str) -> bytes:
+        """Return the bytes of a variant, reading each file only once (blocking on first read)."""
+        data = self._bytes.get(filename)
+        if data is None:
+            data = self._bytes[filename] = (self.cache_dir / filename).read_bytes()
+        return data
+
+
+def _resize(image_module, data: bytes, size: int) -> bytes:
+    """Return the PNG scaled down to fit size x size, keeping its aspect ratio."""
+    with image_module.open(io.BytesIO(data)) as image:
+        image.thumbnail((size, size), image_module.Resampling.LANCZOS)
+        output = io.BytesIO()
+        image.save(output, format="PNG", optimize=True)
+        return output.getvalue()
+
+
+class RdwLogoView(HomeAssistantView):
+    """Serve logo variants with immutable cache headers; aiohttp adds ETag and Last-Modified."""
+
+    url = f"{LOGO_URL}/{{filename}}"
+    name = f"api:{DOMAIN}:logo"
+    requires_auth = False # Brand logos are public, like the static path they replace
+
+    def __init__(self, cache: LogoCache) -> None:
+        """Initialize the view."""
+        self._cache = cache
+
+    async def get(self, request: web.Request, filename: str) -> web.StreamResponse:
+        """Return a logo variant."""
+        if not self._cache.is_variant(filename):
+            raise web.HTTPNotFound
+        return web.FileResponse(
+            self._cache.cache_dir / filename,
+            headers={"Cache-Control": f"public, max-age={LOGO_CACHE_MAX_AGE}, immutable"},
+        )
+
+
+async def async_get_logo_cache(hass: HomeAssistant) -> LogoCache:
+    """Return the logo cache, building it and registering its view on first use."""
+    task: asyncio.Task[LogoCache] | None = hass.data.get(DATA_LOGO_CACHE)
+    if task is None:
+        # A shared task, so entries setting up together build the variants only once
+        task = hass.data[DATA_LOGO_CACHE] = hass.async_create_task(_async_build_logo_cache(hass))
+    try:
+        return await asyncio.shield(task)
+    except Exception:
+        hass.data.pop(DATA_LOGO_CACHE, None) # Let the next entry try again
+        raise
+
+
+async def _async_build_logo_cache(hass: HomeAssistant) -> LogoCache:
+    """Build the logo variants in the executor and register the view serving them."""
+    cache = LogoCache(
+        Path(hass.config.path(f"custom_components/{DOMAIN}/www/brand_logos")),
+        Path(hass.config.path(STORAGE_DIR, LOGO_CACHE_DIR)),
+    )
+    await hass.async_add_executor_job(cache.build)
+    hass.http.register_view(RdwLogoView(cache))
+    return cache
@@ -0,0 +1,63 @@
+"""Offline normalization and sidecode validation of Dutch license plates."""
+import re
+from typing import Final
+
+# RDW sidecodes, X = letter and 9 = digit. Every Dutch plate issued since 1951
+# consists of three groups with six characters in total, in one of these layouts.
+SIDECODES: Final[dict[int, str]] = {
+    1: "XX-99-99",
+    2: "99-99-XX",
+    3: "99-XX-99",
+    4: "XX-99-XX",
+    5: "XX-XX-99",
+    6: "99-XX-XX",
+    7: "99-XXX-9",
+    8: "9-XXX-99",
+    9: "XX-999-X",
+    10: "X-999-XX",
+    11: "XXX-99-X",
+    12: "X-99-XXX",
+    13: "9-XX-999",
+    14: "999-XX-9",
+}
+
+# Characters users commonly type between the groups
+_SEPARATORS: Final = re.compile(r"[\s\-.]+")
+
+
+def _sidecode_regex(layout: str) -> str:
+    """Translate a sidecode layout into a regex group without separators."""
+    return "".join("[A-Z]" if char == "X" else "[0-9]" for char in layout if char != "-")
+
+
+# A single precompiled alternation with one named group per sidecode, so
+# validating and classifying a plate is one regex match.
+_SIDECODE_PATTERN: Final = re.compile(
+    "|".join(f"(?P<s{sidecode}>{_sidecode_regex(layout)})" for sidecode, layout in SIDECODES.items())
+)
+
+
+def get_sidecode(license_plate: str) -> int | None:
+    """Return the sidecode of a compact, uppercase plate, or None if it has none."""
+    match = _SIDECODE_PATTERN.fullmatch(license_plate)
+    if match is None:
+        return None
+    return int(match.lastgroup[1:])
+
+
+def compact_license_plate(value: str) -> str:
+    """Return the input uppercased without separators, whether or not it is a valid plate."""
+    return _SEPARATORS.sub("", value or "").upper()
+
+
+def normalize_license_plate(value: str) -> str | None:
+    """Return the canonical form of a plate (uppercase, no dashes or spaces).
+
+    Returns None if the input cannot be a Dutch license plate, so callers can
+    reject it before making any network request.
+    """
+    plate = compact_license_plate(value)
+    if get_sidecode(plate) is None:
+        return None
+    return plate
+
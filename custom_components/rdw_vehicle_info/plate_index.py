@@ -0,0 +1,163 @@
+"""In-memory fuzzy index of known license plates, for plates misread by cameras (ANPR)."""
+from collections.abc import Iterable, Iterator
+from typing import NamedTuple
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN, PLATE_INDEX_MAX_DISTANCE
+from .plate import compact_license_plate, normalize_license_plate
+
+# Shared index of every plate the integration knows about
+DATA_PLATE_INDEX = f"{DOMAIN}_plate_index"
+
+# Characters camera reads commonly confuse; each group collapses to its first character
+_CONFUSABLE_GROUPS = ("0ODQ", "1IL", "2Z", "5S", "6G", "8B")
+_SKELETON_TABLE = str.maketrans({char: group[0] for group in _CONFUSABLE_GROUPS for char in group[1:]})
+
+
+class PlateCandidate(NamedTuple):
+    """A known plate matching a query."""
+
+    license_plate: str
+    distance: int # Edits after collapsing confusable characters
+    raw_distance: int # Edits on the plate as read, breaks ties between candidates
+
+
+def plate_skeleton(plate: str) -> str:
+    """Collapse confusable characters, so 'G0B1' and 'GO81' share one skeleton."""
+    return plate.translate(_SKELETON_TABLE)
+
+
+def _deletes(key: str, max_distance: int) -> set[str]:
+    """Return the key and every string obtained by deleting up to max_distance characters."""
+    variants = {key}
+    frontier = {key}
+    for _ in range(max_distance):
+        frontier = {variant[:i] + variant[i + 1:] for variant in frontier for i in range(len(variant))}
+        variants |= frontier
+    return variants
+
+
+def _edit_distance(first: str, second: str) -> int:
+    """Return the Damerau-Levenshtein (optimal string alignment) distance."""
+    previous_row: list[int] | None = None
+    row = list(range(len(second) + 1))
+    for i in range(1, len(first) + 1):
+        before, previous_row, row = previous_row, row, [i] + [0] * len(second)
+        for j in range(1, len(second) + 1):
+            cost = first[i - 1] != second[j - 1]
+            row[j] = min(previous_row[j] + 1, row[j - 1] + 1, previous_row[j - 1] + cost)
+            if (
+                before is not None and i > 1 and j > 1
+                and first[i - 1] == second[j - 2] and first[i - 2] == second[j - 1]
+            ):
+                row[j] = min(row[j], before[j - 2] + 1)
+    return row[-1]
+
+
+class PlateIndex:
+    """Known plates indexed for confusable-character and edit-distance queries.
+
+    Plates are grouped by skeleton, so confusable misreads are a single dict
+    lookup. Skeletons are also indexed by their deletion variants (symmetric
+    delete), so a query only compares against the few skeletons that share a
+    variant with it instead of scanning every known plate.
+    """
+
+    def __init__(self, max_distance: int = PLATE_INDEX_MAX_DISTANCE) -> None:
+        """Initialize an empty index."""
+        self.max_distance = max_distance
+        self._by_skeleton: dict[str, set[str]] = {}
+        self._by_delete: dict[str, set[str]] = {}
+        self._count = 0
+
+    def __len__(self) -> int:
+        """Return the number of indexed plates."""
+        return self._count
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the indexed plates."""
+        for plates in self._by_skeleton.values():
+            yield from plates
+
+    def __contains__(self, plate: object) -> bool:
+        """Return True if the exact plate is indexed."""
+        return isinstance(plate, str) and plate in self._by_skeleton.get(plate_skeleton(plate), ())
+
+    def add(self, value: str) -> bool:
+        """Index a plate; returns False if it is not a valid plate or already indexed."""
+        plate = normalize_license_plate(value)
+        if plate is None:
+            return False
+        skeleton = plate_skeleton(plate)
+        plates = self._by_skeleton.get(skeleton)
+        if plates is None:
+            plates = self._by_skeleton[skeleton] = set()
+            for variant in _deletes(skeleton, self.max_distance):
+                self._by_delete.setdefault(variant, set()).add(skeleton)
+        elif plate in plates:
+            return False
+        plates.add(plate)
+        self._count += 1
+        return True
+
+    def add_many(self, values: Iterable[str]) -> int:
+        """Index several plates and return how many were new."""
+        return sum(self.add(value) for value in values)
+
+    def remove(self, value: str) -> bool:
+        """Drop a plate from the index; returns False if it was not indexed."""
+        plate = normalize_license_plate(value)
+        if plate is None:
+            return False
+        skeleton = plate_skeleton(plate)
+        plates = self._by_skeleton.get(skeleton)
+        if plates is None or plate not in plates:
+            return False
+        plates.remove(plate)
+        self._count -= 1
+        if not plates:
+            # Last plate of this skeleton, so its deletion variants no longer point anywhere
+            del self._by_skeleton[skeleton]
+            for variant in _deletes(skeleton, self.max_distance):
+                skeletons = self._by_delete[variant]
+                skeletons.discard(skeleton)
+                if not skeletons:
+                    del self._by_delete[variant]
+        return True
+
+    def remove_many(self, values: Iterable[str]) -> int:
+        """Drop several plates and return how many were indexed."""
+        return sum(self.remove(value) for value in values)
+
+    def search(self, value: str, limit: int = 5) -> list[PlateCandidate]:
+        """Return the known plates closest to a (possibly misread) plate, best first."""
+        query = compact_license_plate(value)
+        if not query:
+            return []
+        skeleton = plate_skeleton(query)
+
+        skeletons: set[str] = set()
+        for variant in _deletes(skeleton, self.max_distance):
+            skeletons.update(self._by_delete.get(variant, ()))
+
+        candidates = []
+        for candidate_skeleton in skeletons:
+            distance = _edit_distance(skeleton, candidate_skeleton)
+            if distance > self.max_distance:
+                continue
+            candidates.extend(
+                PlateCandidate(plate, distance, _edit_distance(query, plate))
+                for plate in self._by_skeleton[candidate_skeleton]
+            )
+        candidates.sort(key=lambda candidate: (candidate.distance, candidate.raw_distance, candidate.license_plate))
+        return candidates[:limit]
+
+
+@callback
+def async_get_plate_index(hass: HomeAssistant) -> PlateIndex:
+    """Return the plate index shared by all entries and services."""
+    index = hass.data.get(DATA_PLATE_INDEX)
+    if index is None:
+        index = hass.data[DATA_PLATE_INDEX] = PlateIndex()
+    return index
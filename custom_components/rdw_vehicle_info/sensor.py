@@ -1,30 +1,45 @@
 """Sensor platform for RDW Vehicle Information."""
 import logging
-from typing import Any
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import date
+from typing import TYPE_CHECKING, Any
 
 from homeassistant.components.sensor import (
     SensorEntity,
+    SensorEntityDescription,
     SensorDeviceClass,
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
-    PERCENTAGE, UnitOfMass, UnitOfLength, UnitOfSpeed, EntityCategory
+    PERCENTAGE, UnitOfMass, UnitOfLength, UnitOfSpeed, UnitOfTime, EntityCategory
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import StateType
-from homeassistant.util.dt import parse_datetime # For parsing date strings
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN, CONF_SENSORS, RDW_API_KEYS
-from .coordinator import RdwDataUpdateCoordinator
+from .const import (
+    DOMAIN, MANUFACTURER, CONF_SENSORS, CONF_COMPACT_MODE, DATA_KEY_IS_STOLEN, DATA_KEY_RECALLS, RDW_API_KEYS,
+    SIGNAL_SENSORS_UPDATED, FLEET_APK_EXPIRING_DAYS, RECALL_INDICATOR_KEY,
+)
+from .coordinator import RdwDataUpdateCoordinator, RdwFleetCoordinator, get_entry_coordinators
+from .derived import async_track_midnight, parse_rdw_date
 from .entity import RdwEntity
 
+if TYPE_CHECKING:
+    from .analytics import FleetTable
+
 _LOGGER = logging.getLogger(__name__)
 
 # Define mappings for specific keys to device class, unit, etc.
 # Enhance this map based on the specific data types and units RDW provides
-SENSOR_DESCRIPTIONS: dict[str, dict] = {
+_SENSOR_ATTRIBUTES: dict[str, dict] = {
     "vervaldatum_apk_dt": {"device_class": SensorDeviceClass.DATE},
     "datum_tenaamstelling_dt": {"device_class": SensorDeviceClass.DATE},
     "datum_eerste_toelating_dt": {"device_class": SensorDeviceClass.DATE},
@@ -46,6 +61,137 @@ SENSOR_DESCRIPTIONS: dict[str, dict] = {
     # Add more specific mappings as needed
 }
 
+# Frozen descriptions built once at import and shared by every configured plate,
+# so entities only hold a reference instead of copying name/unit/class per instance.
+# Example: Device "RDW Vehicle G727FN", Entity "Merk" -> Friendly Name "RDW Vehicle G727FN Merk"
+SENSOR_DESCRIPTIONS: dict[str, SensorEntityDescription] = {
+    key: SensorEntityDescription(
+        key=key,
+        name=key.replace("_", " ").replace(" dt", " Date").capitalize(),
+        **_SENSOR_ATTRIBUTES.get(key, {}),
+    )
+    for key in RDW_API_KEYS
+}
+
+DIAGNOSTIC_SENSOR_DESCRIPTIONS: tuple[SensorEntityDescription, ...] = (
+    SensorEntityDescription(
+        key="last_update_status",
+        name="Last Update Status",
+        entity_category=EntityCategory.DIAGNOSTIC,
+    ),
+    SensorEntityDescription(
+        key="last_update_time",
+        name="Last Update Time",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        entity_category=EntityCategory.DIAGNOSTIC,
+    ),
+    SensorEntityDescription(
+        key="consecutive_errors",
+        name="Consecutive Update Errors",
+        entity_category=EntityCategory.DIAGNOSTIC,
+    ),
+)
+
+SUMMARY_SENSOR_DESCRIPTION = SensorEntityDescription(
+    key="summary",
+    name="Summary",
+    device_class=SensorDeviceClass.DATE,
+    icon="mdi:car-info",
+)
+
+
+@dataclass(frozen=True, kw_only=True)
+class RdwFleetSensorEntityDescription(SensorEntityDescription):
+    """Describes a fleet aggregate sensor computed from the fleet table."""
+
+    value_fn: Callable[["FleetTable", date], StateType]
+
+
+FLEET_SENSOR_DESCRIPTIONS: tuple[RdwFleetSensorEntityDescription, ...] = (
+    RdwFleetSensorEntityDescription(
+        key="fleet_apk_expiring",
+        name=f"APK Expiring Within {FLEET_APK_EXPIRING_DAYS} Days",
+        icon="mdi:calendar-alert",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda table, today: table.apk_expiring(today, FLEET_APK_EXPIRING_DAYS),
+    ),
+    RdwFleetSensorEntityDescription(
+        key="fleet_total_catalogusprijs",
+        name="Total Catalog Price",
+        native_unit_of_measurement="EUR",
+        device_class=SensorDeviceClass.MONETARY,
+        icon="mdi:currency-eur",
+        value_fn=lambda table, today: table.total_catalog_price(),
+    ),
+    RdwFleetSensorEntityDescription(
+        key="fleet_average_age",
+        name="Average Age",
+        native_unit_of_measurement=UnitOfTime.YEARS,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:car-clock",
+        value_fn=lambda table, today: table.average_age(today),
+    ),
+    RdwFleetSensorEntityDescription(
+        key="fleet_open_recalls",
+        name="Open Recalls",
+        icon="mdi:car-wrench",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda table, today: table.open_recalls(),
+    ),
+)
+
+
+@dataclass(frozen=True, kw_only=True)
+class RdwDerivedSensorEntityDescription(SensorEntityDescription):
+    """Describes a sensor derived from one date field and today's date."""
+
+    source_key: str
+    value_fn: Callable[[date, date], StateType]
+
+
+# Created for each plate whose source date sensor is selected
+DERIVED_SENSOR_DESCRIPTIONS: tuple[RdwDerivedSensorEntityDescription, ...] = (
+    RdwDerivedSensorEntityDescription(
+        key="days_until_apk",
+        name="Days Until APK Expiry",
+        native_unit_of_measurement=UnitOfTime.DAYS,
+        icon="mdi:calendar-clock",
+        source_key="vervaldatum_apk_dt",
+        value_fn=lambda apk_expiry, today: (apk_expiry - today).days,
+    ),
+    RdwDerivedSensorEntityDescription(
+        key="vehicle_age",
+        name="Vehicle Age",
+        native_unit_of_measurement=UnitOfTime.YEARS,
+        icon="mdi:car-clock",
+        source_key="datum_eerste_toelating_dt",
+        value_fn=lambda first_admission, today: (
+            today.year - first_admission.year
+            - ((today.month, today.day) < (first_admission.month, first_admission.day))
+        ),
+    ),
+    RdwDerivedSensorEntityDescription(
+        key="days_since_registration",
+        name="Days Since Registration Change",
+        native_unit_of_measurement=UnitOfTime.DAYS,
+        icon="mdi:account-switch",
+        source_key="datum_tenaamstelling_dt",
+        value_fn=lambda registered, today: (today - registered).days,
+    ),
+)
+
+
+def _derived_sensors(
+    coordinators: list[RdwDataUpdateCoordinator], source_keys: list[str] | tuple[str, ...]
+) -> list["RdwDerivedSensor"]:
+    """Return derived sensors for every coordinator whose source key is in source_keys."""
+    return [
+        RdwDerivedSensor(coordinator, description)
+        for coordinator in coordinators
+        for description in DERIVED_SENSOR_DESCRIPTIONS
+        if description.source_key in source_keys
+    ]
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -53,49 +199,112 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the RDW sensor platform."""
-    coordinator: RdwDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
-    license_plate = coordinator.license_plate
+    coordinators = get_entry_coordinators(hass, entry)
 
-    # Get the list of enabled sensors from options (or default to all if first setup)
-    enabled_sensors = entry.options.get(CONF_SENSORS, {key: True for key in RDW_API_KEYS})
+    selected_keys = _selected_keys(entry)
+    _LOGGER.debug("Enabled RDW sensor keys for %s: %s", entry.title, selected_keys)
+
+    # Fleet entries get aggregate sensors on a device of their own, in both modes
+    fleet_coordinator = hass.data[DOMAIN][entry.entry_id]
+    if isinstance(fleet_coordinator, RdwFleetCoordinator):
+        async_add_entities(
+            RdwFleetSensor(fleet_coordinator, entry, description)
+            for description in FLEET_SENSOR_DESCRIPTIONS
+        )
+
+    # Coordinators already hold data from the first refresh, so entities are added
+    # without update_before_add (which would trigger one extra refresh per plate).
+    if entry.options.get(CONF_COMPACT_MODE, False):
+        # Compact mode: a single entity per vehicle carrying the selected fields as attributes
+        _LOGGER.debug("Adding RDW summary sensors for %s (compact mode)", entry.title)
+        summary_sensors = [RdwSummarySensor(coordinator, selected_keys) for coordinator in coordinators]
+        async_add_entities(summary_sensors)
+
+        @callback
+        def _async_update_summary_keys() -> None:
+            """Apply a changed sensor selection to the summary attributes."""
+            keys = _selected_keys(entry)
+            for sensor in summary_sensors:
+                sensor.selected_keys = keys
+                if sensor.hass is not None:
+                    sensor.async_write_ha_state()
+
+        entry.async_on_unload(
+            async_dispatcher_connect(hass, SIGNAL_SENSORS_UPDATED.format(entry.entry_id), _async_update_summary_keys)
+        )
+        return
 
     entities = []
-    for key in RDW_API_KEYS:
-        if enabled_sensors.get(key, False): # Check if sensor is enabled in options
-            _LOGGER.debug("Adding RDW sensor for key: %s", key)
-            entities.append(RdwSensor(coordinator, key))
-        else:
-             _LOGGER.debug("Skipping RDW sensor for key: %s (disabled in options)", key)
+    for coordinator in coordinators:
+        entities.extend(RdwSensor(coordinator, key) for key in selected_keys)
 
+        # Add Diagnostic Sensors
+        entities.extend(
+            RdwDiagnosticSensor(coordinator, description)
+            for description in DIAGNOSTIC_SENSOR_DESCRIPTIONS
+        )
 
-    # Add Diagnostic Sensors
-    entities.extend([
-        RdwDiagnosticSensor(coordinator, "last_update_status", "Last Update Status"),
-        RdwDiagnosticSensor(coordinator, "last_update_time", "Last Update Time", SensorDeviceClass.TIMESTAMP),
-        RdwDiagnosticSensor(coordinator, "consecutive_errors", "Consecutive Update Errors"),
-    ])
+    # Derived date sensors follow the selection of the date they are computed from
+    entities.extend(_derived_sensors(coordinators, selected_keys))
 
-    async_add_entities(entities, True) # True = update coordinator data before adding
+    async_add_entities(entities)
+
+    @callback
+    def _async_update_sensor_selection() -> None:
+        """Add and remove only the sensors whose selection changed, reusing coordinator data."""
+        nonlocal selected_keys
+        new_keys = _selected_keys(entry)
+        added = [key for key in new_keys if key not in selected_keys]
+        removed = [key for key in selected_keys if key not in new_keys]
+        selected_keys = new_keys
+        _LOGGER.debug("Sensor selection of %s changed: added %s, removed %s", entry.title, added, removed)
+
+        # Derived sensors are removed along with their source date sensor
+        removed_keys = [
+            *removed,
+            *(description.key for description in DERIVED_SENSOR_DESCRIPTIONS if description.source_key in removed),
+        ]
+        entity_registry = er.async_get(hass)
+        for coordinator in coordinators:
+            for key in removed_keys:
+                entity_id = entity_registry.async_get_entity_id(
+                    "sensor", DOMAIN, f"{coordinator.license_plate}_{key}".lower()
+                )
+                if entity_id is not None:
+                    # Removing the registry entry also removes the entity from the state machine
+                    entity_registry.async_remove(entity_id)
+
+        if added:
+            async_add_entities(
+                [
+                    *(RdwSensor(coordinator, key) for coordinator in coordinators for key in added),
+                    *_derived_sensors(coordinators, added),
+                ]
+            )
+
+    entry.async_on_unload(
+        async_dispatcher_connect(hass, SIGNAL_SENSORS_UPDATED.format(entry.entry_id), _async_update_sensor_selection)
+    )
+
+
+def _selected_keys(entry: ConfigEntry) -> tuple[str, ...]:
+    """Return the RDW keys enabled in the entry options, in RDW_API_KEYS order."""
+    # Get the list of enabled sensors from options (or default to all if first setup)
+    enabled_sensors = entry.options.get(CONF_SENSORS, {key: True for key in RDW_API_KEYS})
+    return tuple(key for key in RDW_API_KEYS if enabled_sensors.get(key, False))
 
 
 class RdwSensor(RdwEntity, SensorEntity):
     """Representation of an RDW Sensor."""
 
+    # Recall details can be long and only change with the recall indicator itself
+    _unrecorded_attributes = frozenset({DATA_KEY_RECALLS})
+
     def __init__(self, coordinator: RdwDataUpdateCoordinator, data_key: str) -> None:
         """Initialize the sensor."""
         super().__init__(coordinator, data_key)
-
-        # Set entity name based on the data key (will be combined with device name)
-        # Example: Device "RDW Vehicle G727FN", Entity "Merk" -> Friendly Name "RDW Vehicle G727FN Merk"
-        self._attr_name = data_key.replace("_", " ").replace(" dt", " Date").capitalize()
-
-        # Apply specific properties based on the data key
-        description = SENSOR_DESCRIPTIONS.get(data_key, {})
-        self._attr_device_class = description.get("device_class")
-        self._attr_native_unit_of_measurement = description.get("native_unit_of_measurement")
-        self._attr_state_class = description.get("state_class")
-        if "icon" in description:
-             self._attr_icon = description["icon"]
+        # Name, unit, device/state class and icon all come from the shared description
+        self.entity_description = SENSOR_DESCRIPTIONS[data_key]
 
 
     @property
@@ -107,22 +316,11 @@ class RdwSensor(RdwEntity, SensorEntity):
             return None
 
         # Handle specific data types, especially dates
-        if self._attr_device_class == SensorDeviceClass.DATE and isinstance(value, str):
-            # RDW provides dates like 'YYYYMMDD' or 'YYYY-MM-DDTHH:mm:ss.sss'
-            parsed_value = parse_datetime(value) # Try parsing ISO format first
-            if parsed_value:
-                return parsed_value.date()
-            # Try parsing YYYYMMDD if ISO fails
-            elif len(value) == 8 and value.isdigit():
-                 try:
-                    return f"{value[0:4]}-{value[4:6]}-{value[6:8]}" # Return as YYYY-MM-DD string for date type
-                 except ValueError:
-                    return value # Return original if format is unexpected
-            else:
-                return value # Return original string if parsing fails
+        if self.entity_description.device_class == SensorDeviceClass.DATE and isinstance(value, str):
+            return parse_rdw_date(value)
 
         # Convert numeric strings to numbers if appropriate state class is set
-        if self._attr_state_class == SensorStateClass.MEASUREMENT and isinstance(value, str):
+        if self.entity_description.state_class == SensorStateClass.MEASUREMENT and isinstance(value, str):
             try:
                 return float(value)
             except (ValueError, TypeError):
@@ -135,23 +333,73 @@ class RdwSensor(RdwEntity, SensorEntity):
 
         return value
 
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the recall details on the recall indicator sensor."""
+        if self.data_key != RECALL_INDICATOR_KEY:
+            return None
+        recalls = self.coordinator.data.get(DATA_KEY_RECALLS)
+        return {DATA_KEY_RECALLS: recalls} if recalls is not None else None
+
+
+class RdwSummarySensor(RdwEntity, SensorEntity):
+    """Single per-vehicle sensor used in compact mode.
+
+    The state is the APK expiry date; the selected RDW fields are exposed as
+    attributes. Those attributes are excluded from the recorder, since the
+    full record already lives in the coordinator and rarely changes.
+    """
+
+    entity_description = SUMMARY_SENSOR_DESCRIPTION
+    _unrecorded_attributes = frozenset({*RDW_API_KEYS, DATA_KEY_IS_STOLEN, DATA_KEY_RECALLS})
+
+    def __init__(self, coordinator: RdwDataUpdateCoordinator, selected_keys: tuple[str, ...]) -> None:
+        """Initialize the summary sensor."""
+        super().__init__(coordinator, SUMMARY_SENSOR_DESCRIPTION.key)
+        self.selected_keys = selected_keys
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the APK expiry date."""
+        value = self.coordinator.data.get("vervaldatum_apk_dt")
+        if not isinstance(value, str):
+            return None
+        parsed_value = parse_rdw_date(value)
+        # The date device class only accepts real dates
+        return parsed_value if not isinstance(parsed_value, str) else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the selected RDW fields and the stolen status."""
+        data = self.coordinator.data
+        attributes = {key: data[key] for key in self.selected_keys if key in data}
+        attributes[DATA_KEY_IS_STOLEN] = data.get(DATA_KEY_IS_STOLEN)
+        if RECALL_INDICATOR_KEY in self.selected_keys and DATA_KEY_RECALLS in data:
+            attributes[DATA_KEY_RECALLS] = data[DATA_KEY_RECALLS]
+        return attributes
+
+    @property
+    def available(self) -> bool:
+        """Available whenever the coordinator holds data for this vehicle."""
+        return self.coordinator.last_update_success and self.coordinator.data is not None
+
 
 class RdwDiagnosticSensor(RdwEntity, SensorEntity):
     """Representation of an RDW Diagnostic Sensor."""
-    _attr_entity_category = EntityCategory.DIAGNOSTIC
 
     def __init__(
         self,
         coordinator: RdwDataUpdateCoordinator,
-        data_key: str,
-        name: str,
-        device_class: SensorDeviceClass | None = None
+        description: SensorEntityDescription,
     ) -> None:
         """Initialize the diagnostic sensor."""
-        super().__init__(coordinator, data_key)
-        self._attr_name = name # Override name generation
-        self._attr_device_class = device_class
+        super().__init__(coordinator, description.key)
+        self.entity_description = description
 
+    async def async_added_to_hass(self) -> None:
+        """Also follow update cycles that did not change the vehicle data."""
+        await super().async_added_to_hass()
+        self.async_on_remove(self.coordinator.async_add_status_listener(self.async_write_ha_state))
 
     @property
     def native_value(self) -> StateType:
@@ -170,3 +418,77 @@ class RdwDiagnosticSensor(RdwEntity, SensorEntity):
         # Override base availability check as these don't rely on specific data keys
         return self.coordinator is not None
 
+
+class RdwDerivedSensor(RdwEntity, SensorEntity):
+    """Sensor computed from a date field parsed once per coordinator update.
+
+    The value only depends on that date and today's date, so besides
+    coordinator updates it is written once a day on the shared midnight tick.
+    """
+
+    entity_description: RdwDerivedSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: RdwDataUpdateCoordinator,
+        description: RdwDerivedSensorEntityDescription,
+    ) -> None:
+        """Initialize the derived sensor."""
+        super().__init__(coordinator, description.key)
+        self.entity_description = description
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to coordinator updates and the shared midnight tick."""
+        await super().async_added_to_hass()
+        self.async_on_remove(async_track_midnight(self.hass, self.async_write_ha_state))
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the value derived from the parsed date."""
+        source_date = self.coordinator.dates.get(self.entity_description.source_key)
+        if source_date is None:
+            return None
+        return self.entity_description.value_fn(source_date, dt_util.now().date())
+
+    @property
+    def available(self) -> bool:
+        """Available when the coordinator holds a parsable source date."""
+        return (
+            self.coordinator.last_update_success
+            and self.entity_description.source_key in self.coordinator.dates
+        )
+
+
+class RdwFleetSensor(CoordinatorEntity[RdwFleetCoordinator], SensorEntity):
+    """Aggregate over all vehicles of a fleet entry, computed from the fleet table."""
+
+    _attr_has_entity_name = True
+    entity_description: RdwFleetSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: RdwFleetCoordinator,
+        entry: ConfigEntry,
+        description: RdwFleetSensorEntityDescription,
+    ) -> None:
+        """Initialize the fleet sensor."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._attr_unique_id = f"{entry.entry_id}_{description.key}"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, entry.entry_id)},
+            name=f"RDW Fleet {entry.title}",
+            manufacturer=MANUFACTURER,
+            configuration_url="https://opendata.rdw.nl/",
+        )
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to fleet refreshes and the shared midnight tick (date-based aggregates)."""
+        await super().async_added_to_hass()
+        self.async_on_remove(async_track_midnight(self.hass, self.async_write_ha_state))
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the aggregate over the fleet table."""
+        return self.entity_description.value_fn(self.coordinator.table, dt_util.now().date())
+
@@ -0,0 +1,345 @@
+"""Services for RDW Vehicle Information."""
+import asyncio
+import csv
+import json
+import logging
+import os
+import re
+import time
+from collections.abc import Iterable
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry, ConfigEntryState
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse, callback
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+
+from .api import RdwApiError, RdwApiNoDataError
+from .connection import async_get_api_client
+from .const import (
+    DOMAIN, CONF_APP_TOKEN, RDW_API_KEYS, DATA_KEY_IS_STOLEN, SERVICE_SEARCH_PLATE, SERVICE_LOOKUP_PLATE,
+    SERVICE_IMPORT_PLATES, SERVICE_REFRESH_ALL, SERVICE_EXPORT_RECORDS, ATTR_LICENSE_PLATE, ATTR_LIMIT, ATTR_PATH,
+    ATTR_CONCURRENCY, ATTR_FORMAT, ATTR_FILENAME, EXPORT_FORMATS, EXPORT_DIR,
+    EVENT_REFRESH_PROGRESS, EVENT_REFRESH_FINISHED, REFRESH_ALL_CONCURRENCY, REFRESH_ALL_PROGRESS_EVERY,
+)
+from .coordinator import RdwDataUpdateCoordinator, RdwFleetCoordinator, get_entry_coordinators
+from .plate import compact_license_plate, normalize_license_plate
+from .plate_index import DATA_PLATE_INDEX, PlateCandidate, PlateIndex, async_get_plate_index
+from .store import RdwRecord
+
+_LOGGER = logging.getLogger(__name__)
+
+# Task of the refresh_all run in progress, so runs cannot overlap
+DATA_REFRESH_ALL = f"{DOMAIN}_refresh_all"
+
+# Plates in an import file are separated by line breaks, commas, semicolons or tabs
+_IMPORT_SEPARATORS = re.compile(r"[\r\n,;\t]+")
+
+# Columns of an export: the plate, every RDW field, stolen status and fetch state
+_EXPORT_COLUMNS = (
+    ATTR_LICENSE_PLATE, *RDW_API_KEYS, DATA_KEY_IS_STOLEN,
+    "last_updated", "last_update_success", "error_count",
+)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration's services (called once from async_setup)."""
+    # Imported here so loading the integration does not pull in voluptuous and config_validation
+    import voluptuous as vol
+    import homeassistant.helpers.config_validation as cv
+    from homeassistant.helpers.service import async_register_admin_service
+
+    search_plate_schema = vol.Schema({
+        vol.Required(ATTR_LICENSE_PLATE): cv.string,
+        vol.Optional(ATTR_LIMIT, default=5): vol.All(vol.Coerce(int), vol.Range(min=1, max=50)),
+    })
+    lookup_plate_schema = vol.Schema({
+        vol.Required(ATTR_LICENSE_PLATE): cv.string,
+    })
+    import_plates_schema = vol.Schema({
+        vol.Required(ATTR_PATH): cv.string,
+    })
+    refresh_all_schema = vol.Schema({
+        vol.Optional(ATTR_CONCURRENCY, default=REFRESH_ALL_CONCURRENCY): vol.All(vol.Coerce(int), vol.Range(min=1, max=16)),
+    })
+    export_records_schema = vol.Schema({
+        vol.Optional(ATTR_FORMAT, default=EXPORT_FORMATS[0]): vol.In(EXPORT_FORMATS),
+        vol.Optional(ATTR_FILENAME): cv.string,
+    })
+
+    async def _async_search_plate(call: ServiceCall) -> ServiceResponse:
+        """Return the known plates closest to a (possibly misread) plate."""
+        candidates = async_get_plate_index(hass).search(call.data[ATTR_LICENSE_PLATE], call.data[ATTR_LIMIT])
+        return {"candidates": [_candidate_as_dict(candidate) for candidate in candidates]}
+
+    async def _async_lookup_plate(call: ServiceCall) -> ServiceResponse:
+        """Look up a plate, falling back to the best index candidate if RDW does not know it."""
+        query = compact_license_plate(call.data[ATTR_LICENSE_PLATE])
+        index = async_get_plate_index(hass)
+
+        plate = normalize_license_plate(query)
+        if plate is not None:
+            data = await _async_get_vehicle(hass, plate)
+            if data is not None:
+                index.add(plate)
+                return {"license_plate": query, "matched_plate": plate, "data": data, "candidates": []}
+
+        # Misread: one index query, then at most one request for the best candidate
+        candidates = [candidate for candidate in index.search(query) if candidate.license_plate != plate]
+        data = None
+        if candidates:
+            _LOGGER.debug("No RDW data for %s, trying index candidate %s", query, candidates[0].license_plate)
+            data = await _async_get_vehicle(hass, candidates[0].license_plate)
+        return {
+            "license_plate": query,
+            "matched_plate": candidates[0].license_plate if data is not None else None,
+            "data": data,
+            "candidates": [_candidate_as_dict(candidate) for candidate in candidates],
+        }
+
+    async def _async_import_plates(call: ServiceCall) -> None:
+        """Bulk-import known plates from a text or CSV file into the index."""
+        path = call.data[ATTR_PATH]
+        if not hass.config.is_allowed_path(path):
+            raise ServiceValidationError(f"Access to {path} is not allowed, add it to allowlist_external_dirs")
+
+        # The index is rebuilt in the executor and swapped in, so searches never see it half-built
+        index = async_get_plate_index(hass)
+        known_plates = list(index)
+        try:
+            new_index, imported = await hass.async_add_executor_job(_build_index, path, known_plates)
+        except OSError as err:
+            raise HomeAssistantError(f"Error reading plates from {path}: {err}") from err
+        # Re-add plates indexed while the import was running
+        if len(index) != len(known_plates):
+            new_index.add_many(plate for plate in index if plate not in new_index)
+        hass.data[DATA_PLATE_INDEX] = new_index
+        _LOGGER.info("Imported %d new plates from %s, index now holds %d plates", imported, path, len(new_index))
+
+    async def _async_refresh_all(call: ServiceCall) -> ServiceResponse:
+        """Start refreshing every configured plate in the background."""
+        running: asyncio.Task | None = hass.data.get(DATA_REFRESH_ALL)
+        if running is not None and not running.done():
+            raise HomeAssistantError("A refresh of all vehicles is already running")
+
+        # Fleets are refreshed as one unit, so their plates keep the batched requests
+        units = _refresh_order([hass.data[DOMAIN][entry.entry_id] for entry in _loaded_entries(hass)])
+        run_id = call.context.id
+        hass.data[DATA_REFRESH_ALL] = hass.async_create_background_task(
+            _async_run_refresh_all(hass, run_id, units, call.data[ATTR_CONCURRENCY]),
+            f"RDW refresh all {run_id}",
+        )
+        return {"run_id": run_id, "total": sum(len(_unit_plates(unit)) for unit in units)}
+
+    async def _async_export_records(call: ServiceCall) -> None:
+        """Write every configured plate's record to a CSV or JSONL file in the export directory."""
+        file_format = call.data[ATTR_FORMAT]
+        filename = call.data.get(ATTR_FILENAME) or f"{DOMAIN}_export.{file_format}"
+        # Confined to its own directory with a matching suffix, so no configuration file can be overwritten
+        if Path(filename).name != filename or filename.startswith(".") or Path(filename).suffix != f".{file_format}":
+            raise ServiceValidationError(f"{filename} is not a plain file name ending in .{file_format}")
+        path = Path(hass.config.path(EXPORT_DIR, filename))
+
+        # Only references are collected here; rows are built and written one at a time in the executor
+        rows = [
+            (coordinator.license_plate, coordinator.data, coordinator.last_update_success_timestamp,
+             coordinator.last_update_success, coordinator.error_count)
+            for entry in _loaded_entries(hass)
+            for coordinator in get_entry_coordinators(hass, entry)
+        ]
+        try:
+            await hass.async_add_executor_job(_write_export, path, file_format, rows)
+        except OSError as err:
+            raise HomeAssistantError(f"Error writing export to {path}: {err}") from err
+        _LOGGER.info("Exported %d RDW vehicles to %s", len(rows), path)
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_SEARCH_PLATE, _async_search_plate,
+        schema=search_plate_schema, supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_LOOKUP_PLATE, _async_lookup_plate,
+        schema=lookup_plate_schema, supports_response=SupportsResponse.ONLY,
+    )
+    # Reads files from the allowed external directories, so only admins may call it
+    async_register_admin_service(
+        hass, DOMAIN, SERVICE_IMPORT_PLATES, _async_import_plates, schema=import_plates_schema,
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_REFRESH_ALL, _async_refresh_all,
+        schema=refresh_all_schema, supports_response=SupportsResponse.OPTIONAL,
+    )
+    # Writes files into the config directory, so only admins may call it
+    async_register_admin_service(
+        hass, DOMAIN, SERVICE_EXPORT_RECORDS, _async_export_records, schema=export_records_schema,
+    )
+
+
+def _loaded_entries(hass: HomeAssistant) -> list[ConfigEntry]:
+    """Return the integration's entries that are set up."""
+    return [
+        entry for entry in hass.config_entries.async_entries(DOMAIN)
+        if entry.state is ConfigEntryState.LOADED
+    ]
+
+
+def _unit_plates(unit: RdwDataUpdateCoordinator | RdwFleetCoordinator) -> list[RdwDataUpdateCoordinator]:
+    """Return the plate coordinators refreshed by a refresh_all unit."""
+    if isinstance(unit, RdwFleetCoordinator):
+        return list(unit.coordinators.values())
+    return [unit]
+
+
+def _refresh_order(
+    units: list[RdwDataUpdateCoordinator | RdwFleetCoordinator],
+) -> list[RdwDataUpdateCoordinator | RdwFleetCoordinator]:
+    """Order units for a forced refresh: failing or empty plates first, then the longest not updated."""
+
+    def _key(unit: RdwDataUpdateCoordinator | RdwFleetCoordinator) -> tuple[bool, float]:
+        plates = _unit_plates(unit)
+        return (
+            not any(plate.last_update_error or plate.data is None for plate in plates),
+            min(
+                (
+                    plate.last_update_success_timestamp.timestamp()
+                    if plate.last_update_success_timestamp else float("-inf")
+                    for plate in plates
+                ),
+                default=float("-inf"),
+            ),
+        )
+
+    return sorted(units, key=_key)
+
+
+async def _async_run_refresh_all(
+    hass: HomeAssistant,
+    run_id: str,
+    units: list[RdwDataUpdateCoordinator | RdwFleetCoordinator],
+    concurrency: int,
+) -> None:
+    """Refresh vehicles through a bounded worker queue and report progress as events.
+
+    Single vehicles are refreshed one by one; a fleet is one queue item
+    refreshed through its batched requests. Requests to RDW still pass the
+    shared rate limiter, so the run goes as fast as the upstream limits allow
+    without bursting past them.
+    """
+    queue: asyncio.Queue[RdwDataUpdateCoordinator | RdwFleetCoordinator] = asyncio.Queue()
+    for unit in units:
+        queue.put_nowait(unit)
+    total = sum(len(_unit_plates(unit)) for unit in units)
+    counts = {"succeeded": 0, "failed": 0}
+    failed_plates: list[str] = []
+    started = time.monotonic()
+    _LOGGER.info("Refreshing %d RDW vehicles with %d workers", total, concurrency)
+
+    def _progress() -> dict[str, Any]:
+        """Return the event data describing the run so far."""
+        return {
+            "run_id": run_id,
+            "total": total,
+            "done": counts["succeeded"] + counts["failed"],
+            **counts,
+            "elapsed": round(time.monotonic() - started, 1),
+        }
+
+    async def _async_worker() -> None:
+        """Refresh units until the queue is empty."""
+        while not queue.empty():
+            unit = queue.get_nowait()
+            await unit.async_refresh()
+            done_before = counts["succeeded"] + counts["failed"]
+            for coordinator in _unit_plates(unit):
+                if coordinator.last_update_success and not coordinator.last_update_error:
+                    counts["succeeded"] += 1
+                else:
+                    counts["failed"] += 1
+                    failed_plates.append(coordinator.license_plate)
+            done = counts["succeeded"] + counts["failed"]
+            # A fleet can complete many plates at once, so report each time a multiple is passed
+            if done // REFRESH_ALL_PROGRESS_EVERY > done_before // REFRESH_ALL_PROGRESS_EVERY and done < total:
+                hass.bus.async_fire(EVENT_REFRESH_PROGRESS, _progress())
+
+    await asyncio.gather(*(_async_worker() for _ in range(min(concurrency, len(units)) or 1)))
+
+    _LOGGER.info("Refreshed %d RDW vehicles: %d succeeded, %d failed", total, counts["succeeded"], counts["failed"])
+    hass.bus.async_fire(EVENT_REFRESH_FINISHED, {**_progress(), "failed_plates": failed_plates})
+
+
+def _candidate_as_dict(candidate: PlateCandidate) -> dict[str, Any]:
+    """Return a service response entry for an index candidate."""
+    return {"license_plate": candidate.license_plate, "distance": candidate.distance}
+
+
+async def _async_get_vehicle(hass: HomeAssistant, plate: str) -> dict[str, Any] | None:
+    """Return a vehicle's data from a configured coordinator, or from RDW if it is not configured."""
+    for entry in _loaded_entries(hass):
+        for coordinator in get_entry_coordinators(hass, entry):
+            if coordinator.license_plate == plate and coordinator.data:
+                return dict(coordinator.data)
+
+    # Use the app token of any entry that has one, so lookups get the higher limits
+    app_token = next(
+        (token for entry in hass.config_entries.async_entries(DOMAIN) if (token := entry.options.get(CONF_APP_TOKEN))),
+        None,
+    )
+    try:
+        return await async_get_api_client(hass, app_token).get_vehicle_data(plate)
+    except RdwApiNoDataError:
+        return None
+    except RdwApiError as err:
+        raise HomeAssistantError(f"Error fetching RDW data for {plate}: {err}") from err
+
+
+def _build_index(path: str, known_plates: list[str]) -> tuple[PlateIndex, int]:
+    """Build a new index from the known plates and a plate file (runs in the executor)."""
+    index = PlateIndex()
+    index.add_many(known_plates)
+    text = Path(path).read_text(encoding="utf-8-sig")
+    imported = index.add_many(_IMPORT_SEPARATORS.split(text))
+    return index, imported
+
+
+def _export_rows(
+    rows: Iterable[tuple[str, RdwRecord | None, datetime | None, bool, int]]
+) -> Iterable[dict[str, Any]]:
+    """Yield one export row per plate, in _EXPORT_COLUMNS order."""
+    for plate, record, last_updated, last_update_success, error_count in rows:
+        record = record or {}
+        yield {
+            ATTR_LICENSE_PLATE: plate,
+            **{key: record.get(key) for key in RDW_API_KEYS},
+            DATA_KEY_IS_STOLEN: record.get(DATA_KEY_IS_STOLEN),
+            "last_updated": last_updated.isoformat() if last_updated else None,
+            "last_update_success": last_update_success,
+            "error_count": error_count,
+        }
+
+
+def _write_export(
+    path: Path, file_format: str, rows: Iterable[tuple[str, RdwRecord | None, datetime | None, bool, int]]
+) -> None:
+    """Stream the export to a temporary file and move it into place (runs in the executor).
+
+    Readers never see a half-written export, and rows are written as they are
+    built, so memory use does not grow with the number of plates.
+    """
+    path.parent.mkdir(exist_ok=True)
+    temp_path = path.with_name(f"{path.name}.tmp")
+    try:
+        with temp_path.open("w", encoding="utf-8", newline="") as file:
+            if file_format == "csv":
+                writer = csv.DictWriter(file, fieldnames=_EXPORT_COLUMNS)
+                writer.writeheader()
+                writer.writerows(_export_rows(rows))
+            else:
+                for row in _export_rows(rows):
+                    file.write(json.dumps(row, ensure_ascii=False, separators=(",", ":")))
+                    file.write("\n")
+        os.replace(temp_path, path)
+    except OSError:
+        temp_path.unlink(missing_ok=True)
+        raise
@@ -0,0 +1,84 @@
+"""Compact, shared-value storage for RDW vehicle records."""
+import sys
+from collections.abc import Iterator, Mapping
+from typing import Any, Final
+
+from .const import RDW_API_KEYS, RDW_CATEGORICAL_KEYS, DATA_KEY_IS_STOLEN, DATA_KEY_RECALLS
+
+# Field layout shared by every record: field name -> position in the value tuple.
+# Known fields get fixed positions; fields RDW adds later are appended on first sight.
+_FIELDS: list[str] = [*RDW_API_KEYS, DATA_KEY_IS_STOLEN, DATA_KEY_RECALLS]
+_FIELD_INDEX: dict[str, int] = {field: index for index, field in enumerate(_FIELDS)}
+
+# Marks a field that is absent from a record (None is a valid value, e.g. is_stolen)
+_MISSING: Final = object()
+
+
+def _field_index(field: str) -> int:
+    """Return the position of a field, registering it if it is new."""
+    index = _FIELD_INDEX.get(field)
+    if index is None:
+        index = _FIELD_INDEX[field] = len(_FIELDS)
+        _FIELDS.append(sys.intern(field))
+    return index
+
+
+def _compact_value(field: str, value: Any) -> Any:
+    """Intern categorical strings so thousands of records share one copy."""
+    if isinstance(value, str) and field in RDW_CATEGORICAL_KEYS:
+        return sys.intern(value)
+    return value
+
+
+class RdwRecord(Mapping[str, Any]):
+    """Read-only mapping of one vehicle's combined data, stored as a single tuple.
+
+    Behaves like the dict it replaces (``get``, ``in``, ``[]``, iteration), but
+    holds its values in a slotted object aligned to a shared field layout
+    instead of a per-plate dict, with categorical values interned.
+    """
+
+    __slots__ = ("_values",)
+
+    def __init__(self, values: tuple[Any, ...]) -> None:
+        """Initialize the record from values aligned to the shared field layout."""
+        self._values = values
+
+    @classmethod
+    def from_mapping(cls, data: Mapping[str, Any]) -> "RdwRecord":
+        """Build a record from a mapping such as a decoded RDW row."""
+        values: list[Any] = [_MISSING] * len(_FIELDS)
+        for field, value in data.items():
+            index = _field_index(field)
+            if index >= len(values):
+                values.extend([_MISSING] * (index + 1 - len(values)))
+            values[index] = _compact_value(field, value)
+        # Drop trailing missing fields so equal records always have equal tuples
+        while values and values[-1] is _MISSING:
+            values.pop()
+        return cls(tuple(values))
+
+    def __getitem__(self, key: str) -> Any:
+        """Return the value of a field."""
+        index = _FIELD_INDEX.get(key)
+        if index is None or index >= len(self._values) or self._values[index] is _MISSING:
+            raise KeyError(key)
+        return self._values[index]
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the fields present in this record."""
+        return (_FIELDS[index] for index, value in enumerate(self._values) if value is not _MISSING)
+
+    def __len__(self) -> int:
+        """Return the number of fields present in this record."""
+        return sum(1 for value in self._values if value is not _MISSING)
+
+    def __eq__(self, other: object) -> bool:
+        """Compare records by their value tuples, other mappings field by field."""
+        if isinstance(other, RdwRecord):
+            return self._values == other._values
+        return super().__eq__(other)
+
+    def __repr__(self) -> str:
+        """Return a dict-like representation."""
+        return f"RdwRecord({dict(self)!r})"
@@ -0,0 +1,21 @@
+"""Tests for parsing pasted fleet plate lists."""
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.rdw_vehicle_info.config_flow import parse_plate_list, skipped_plates_placeholders
+
+
+def test_parse_plate_list_reports_invalid_entries() -> None:
+    """Valid plates are normalized and deduplicated, everything else is returned as skipped."""
+    plates, invalid = parse_plate_list('kenteken\n"G-727-FN";g727fn, 12-AB-34\nnot a plate\n\n')
+    assert plates == ["G727FN", "12AB34"]
+    assert invalid == ["kenteken", "not a plate"]
+
+
+def test_skipped_plates_placeholders_truncates_long_lists() -> None:
+    """Long lists of skipped entries are cut off with a count of the rest."""
+    placeholders = skipped_plates_placeholders([f"x{index}" for index in range(25)], [])
+    assert placeholders["invalid_count"] == "25"
+    assert placeholders["invalid"].endswith("x19, ... (+5)")
+    assert placeholders["configured"] == "-"
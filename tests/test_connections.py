@@ -0,0 +1,99 @@
+"""Connection reuse over refresh cycles against a local server, counted with the session trace config."""
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+pytest.importorskip("homeassistant")
+pytest.importorskip("bs4")
+
+from aiohttp import ClientSession, TCPConnector, web
+
+from custom_components.rdw_vehicle_info.api import RdwApiClient, RdwRateLimiter
+from custom_components.rdw_vehicle_info.connection import (
+    DATA_CONNECTION_STATS,
+    _create_trace_config,
+    async_get_connection_stats,
+    async_get_session,
+)
+from custom_components.rdw_vehicle_info.const import API_TOKEN_MAX_CONCURRENT, HTTP_CONNECTION_LIMIT_PER_HOST
+
+PLATES = [f"GB{index:04d}" for index in range(32)]
+CYCLES = 2
+
+_NOT_STOLEN_PAGE = (
+    '<div id="panel-4"><div class="card-block">'
+    "<p>Uw zoekopdracht naar het object heeft geen resultaat opgeleverd</p></div></div>"
+)
+
+
+async def _handle_vehicle(request: web.Request) -> web.Response:
+    await asyncio.sleep(0.01)
+    return web.json_response([{"kenteken": request.query.get("kenteken", "")}])
+
+
+async def _handle_stolen(request: web.Request) -> web.Response:
+    await asyncio.sleep(0.01)
+    return web.Response(text=_NOT_STOLEN_PAGE, content_type="text/html")
+
+
+async def _refresh_cycles(session: ClientSession, stats: dict[str, int], base_url: str) -> list[int]:
+    """Refresh all plates CYCLES times; return the connections created in each cycle."""
+    client = RdwApiClient(session, rate_limiter=RdwRateLimiter(0, API_TOKEN_MAX_CONCURRENT))
+    client._rdw_base_url = f"{base_url}/vehicle"
+    client._stolen_base_url = f"{base_url}/stolen"
+    created = []
+    for _ in range(CYCLES):
+        before = stats["connections_created"]
+        # A fleet refresh: rate limited vehicle requests and unthrottled stolen checks for every plate
+        await asyncio.gather(
+            *(client.get_vehicle_data(plate) for plate in PLATES),
+            *(client.async_check_stolen(plate) for plate in PLATES),
+        )
+        created.append(stats["connections_created"] - before)
+    return created
+
+
+async def _compare() -> tuple[list[int], list[int]]:
+    app = web.Application()
+    app.router.add_get("/vehicle", _handle_vehicle)
+    app.router.add_get("/stolen", _handle_stolen)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        # Before: a session like Home Assistant's shared one (no per-host limit to speak of)
+        shared_stats = {"requests": 0, "connections_created": 0, "connections_reused": 0, "dns_lookups": 0}
+        async with ClientSession(
+            connector=TCPConnector(limit=4096, limit_per_host=100),
+            trace_configs=[_create_trace_config(shared_stats)],
+        ) as shared_session:
+            shared = await _refresh_cycles(shared_session, shared_stats, base_url)
+
+        # After: the integration's own session
+        hass = MagicMock()
+        hass.data = {}
+        session = async_get_session(hass)
+        try:
+            dedicated = await _refresh_cycles(session, hass.data[DATA_CONNECTION_STATS], base_url)
+            assert async_get_connection_stats(hass)["requests"] == 2 * len(PLATES) * CYCLES
+        finally:
+            await session.close()
+    finally:
+        await runner.cleanup()
+    return shared, dedicated
+
+
+def test_connections_per_refresh_cycle() -> None:
+    """The dedicated session caps connections per host and reuses them in the next cycle."""
+    shared, dedicated = asyncio.run(_compare())
+    print(
+        f"\n{len(PLATES)} plates, new connections per refresh cycle: "
+        f"{shared} with a shared-style session, {dedicated} with the dedicated session"
+    )
+    assert dedicated[0] <= HTTP_CONNECTION_LIMIT_PER_HOST
+    assert all(created == 0 for created in dedicated[1:])
+    assert sum(dedicated) <= sum(shared)
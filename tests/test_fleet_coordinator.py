@@ -0,0 +1,58 @@
+"""Tests for fleet refreshes answered with 304 Not Modified."""
+import asyncio
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.rdw_vehicle_info.api import RdwApiError, RdwApiNotModified
+from custom_components.rdw_vehicle_info.const import RECALL_INDICATOR_KEY
+from custom_components.rdw_vehicle_info.coordinator import RdwFleetCoordinator
+
+RECALLS = [{"referentiecode_rdw": "R001"}]
+
+
+def _fleet(tmp_path: Path, responses: list) -> RdwFleetCoordinator:
+    """Return a fleet of two plates whose batched requests answer with the given responses in turn."""
+    hass = MagicMock()
+    hass.config.path.side_effect = lambda *parts: str(tmp_path.joinpath(*parts))
+    client = MagicMock()
+    client.async_check_stolen = AsyncMock(return_value=False)
+    client.get_recalls = AsyncMock(side_effect=[RdwApiError("recalls unavailable"), RECALLS])
+
+    async def _iter_vehicles_data(plates, validators):
+        response = responses.pop(0)
+        if response is RdwApiNotModified:
+            raise RdwApiNotModified
+        for row in response:
+            yield row
+
+    client.iter_vehicles_data = _iter_vehicles_data
+    return RdwFleetCoordinator(hass, "RDW Fleet", client, ["GB0001", "GB0002"], None)
+
+
+def test_not_modified_batch_only_vouches_for_returned_plates(tmp_path: Path) -> None:
+    """A 304 keeps plates the last full response returned, not plates RDW stopped returning."""
+    both = [{"kenteken": "GB0001", "merk": "VOLVO"}, {"kenteken": "GB0002", "merk": "SAAB"}]
+    fleet = _fleet(tmp_path, [both, both[:1], RdwApiNotModified])
+
+    for _ in range(3):
+        asyncio.run(fleet._async_update_data())
+
+    assert fleet.coordinators["GB0001"].data["merk"] == "VOLVO"
+    assert "merk" not in fleet.coordinators["GB0002"].data
+
+
+def test_failed_recall_fetch_is_retried_on_not_modified(tmp_path: Path) -> None:
+    """Recall details that failed to load are fetched again when the RDW data is unchanged."""
+    rows = [{"kenteken": "GB0001", RECALL_INDICATOR_KEY: "Ja"}, {"kenteken": "GB0002", RECALL_INDICATOR_KEY: "Nee"}]
+    fleet = _fleet(tmp_path, [rows, RdwApiNotModified])
+
+    asyncio.run(fleet._async_update_data())
+    assert fleet.coordinators["GB0001"].recalls is None
+    asyncio.run(fleet._async_update_data())
+
+    assert fleet.coordinators["GB0001"].recalls == RECALLS
+    assert fleet.client.get_recalls.await_count == 2
@@ -0,0 +1,82 @@
+"""Import-time checks: heavy dependencies are only loaded when their feature is used."""
+import json
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# What Home Assistant has loaded before it imports the integration and its platforms
+PRELOADED = (
+    "homeassistant.core",
+    "homeassistant.config_entries",
+    "homeassistant.helpers.update_coordinator",
+    "homeassistant.helpers.entity_platform",
+    "homeassistant.components.sensor",
+    "homeassistant.components.binary_sensor",
+    "homeassistant.components.image",
+    "homeassistant.components.http",
+    "homeassistant.components.diagnostics",
+)
+INTEGRATION = (
+    "custom_components.rdw_vehicle_info",
+    "custom_components.rdw_vehicle_info.sensor",
+    "custom_components.rdw_vehicle_info.binary_sensor",
+    "custom_components.rdw_vehicle_info.image",
+    "custom_components.rdw_vehicle_info.diagnostics",
+)
+# Loaded on first use only: the stolen check, fleets, logo building and the config flow / services
+DEFERRED = ("bs4", "numpy", "PIL", "voluptuous", "homeassistant.helpers.config_validation")
+
+# Plain import statements, -X importtime does not log modules loaded through importlib.import_module
+_SCRIPT = """
+import json, sys
+{preloaded}
+before = set(sys.modules)
+{integration}
+print(json.dumps(sorted(set(sys.modules) - before)))
+"""
+
+
+def _import_integration() -> tuple[list[str], str]:
+    """Import the integration in a fresh interpreter; return the new modules and the importtime log."""
+    result = subprocess.run(
+        [
+            sys.executable, "-X", "importtime", "-c",
+            _SCRIPT.format(
+                preloaded="\n".join(f"import {name}" for name in PRELOADED),
+                integration="\n".join(f"import {name}" for name in INTEGRATION),
+            ),
+        ],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout), result.stderr
+
+
+def test_heavy_dependencies_are_deferred() -> None:
+    """Importing the integration and its platforms loads none of the deferred modules."""
+    new_modules, _ = _import_integration()
+    loaded = [
+        module for module in new_modules
+        if any(module == name or module.startswith(f"{name}.") for name in DEFERRED)
+    ]
+    assert not loaded
+
+
+def test_import_time(capsys: pytest.CaptureFixture[str]) -> None:
+    """Report the cumulative import time of the integration modules."""
+    _, log = _import_integration()
+    # -X importtime lines: "import time: <self us> | <cumulative us> | <module, indented by nesting>"
+    total = sum(
+        int(match["cumulative"])
+        for match in re.finditer(r"^import time:\s+\d+ \|\s+(?P<cumulative>\d+) \| (?P<module>\S+)$", log, re.M)
+        if match["module"] in INTEGRATION
+    )
+    with capsys.disabled():
+        print(f"\nrdw_vehicle_info import time: {total / 1000:.1f} ms")
+    assert total > 0
@@ -0,0 +1,29 @@
+"""Tests for the pre-sized brand logo variants."""
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("homeassistant")
+Image = pytest.importorskip("PIL.Image")
+
+from custom_components.rdw_vehicle_info.const import LOGO_SIZES, LOGO_URL
+from custom_components.rdw_vehicle_info.logos import LogoCache
+
+
+def test_build_writes_variants_and_quotes_urls(tmp_path: Path) -> None:
+    """Variants are complete files with URL-safe links, even for brands with spaces."""
+    source_dir = tmp_path / "brand_logos"
+    source_dir.mkdir()
+    Image.new("RGBA", (512, 256), "red").save(source_dir / "Land Rover.png")
+    cache = LogoCache(source_dir, tmp_path / "cache")
+    (tmp_path / "cache").mkdir()
+    (tmp_path / "cache" / "left.over.png.tmp").write_bytes(b"partial")
+
+    cache.build()
+
+    filename = cache.filename("land rover", max(LOGO_SIZES))
+    assert filename is not None and filename.startswith("land rover.")
+    assert cache.url(filename) == f"{LOGO_URL}/land%20rover.{filename.split('.', 1)[1]}"
+    with Image.open(cache.cache_dir / filename) as image:
+        assert image.size == (max(LOGO_SIZES), max(LOGO_SIZES) // 2)
+    assert sorted(path.suffix for path in cache.cache_dir.iterdir()) == [".png"] * len(LOGO_SIZES)
@@ -0,0 +1,122 @@
+"""Memory benchmarks for per-plate entities and cached records, measured with tracemalloc."""
+import gc
+import json
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from custom_components.rdw_vehicle_info.const import DOMAIN, MANUFACTURER, RDW_API_KEYS, RDW_CATEGORICAL_KEYS
+from custom_components.rdw_vehicle_info.coordinator import RdwDataUpdateCoordinator
+from custom_components.rdw_vehicle_info.sensor import _SENSOR_ATTRIBUTES, RdwSensor
+from custom_components.rdw_vehicle_info.store import RdwRecord
+
+PLATES = 1_000
+RECORDS = 10_000
+# Distinct values per categorical field (a handful of makes, colours, "Ja"/"Nee", ...)
+CATEGORICAL_POOL = 8
+
+
+def _measure(build: Callable[[], Any]) -> tuple[Any, int]:
+    """Return what build() returns and the bytes it still holds afterwards."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = build()
+        gc.collect()
+        return result, tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+
+class _PerInstanceSensor(RdwSensor):
+    """The sensor as it was before shared descriptions: name, attributes and DeviceInfo per entity."""
+
+    def __init__(self, coordinator: RdwDataUpdateCoordinator, data_key: str) -> None:
+        """Initialize the sensor the old way."""
+        CoordinatorEntity.__init__(self, coordinator)
+        self.data_key = data_key
+        self._license_plate = coordinator.license_plate
+        self._attr_unique_id = f"{self._license_plate}_{self.data_key}".lower()
+        data = coordinator.data or {}
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, self._license_plate)},
+            name=f"RDW Vehicle {self._license_plate}",
+            manufacturer=MANUFACTURER,
+            model=data.get("merk", "Unknown") + " " + data.get("handelsbenaming", ""),
+            entry_type=None,
+            configuration_url="https://opendata.rdw.nl/",
+            sw_version=data.get("typegoedkeuringsnummer"),
+        )
+        self._attr_name = data_key.replace("_", " ").replace(" dt", " Date").capitalize()
+        attributes = _SENSOR_ATTRIBUTES.get(data_key, {})
+        self._attr_device_class = attributes.get("device_class")
+        self._attr_native_unit_of_measurement = attributes.get("native_unit_of_measurement")
+        self._attr_state_class = attributes.get("state_class")
+        if "icon" in attributes:
+            self._attr_icon = attributes["icon"]
+
+
+@pytest.fixture(name="coordinators")
+def coordinators_fixture(tmp_path: Path) -> list[RdwDataUpdateCoordinator]:
+    """Return plate coordinators for PLATES plates; entity construction does not use hass."""
+    hass = MagicMock()
+    hass.config.path.side_effect = lambda *parts: str(tmp_path.joinpath(*parts))
+    return [
+        RdwDataUpdateCoordinator(
+            hass, f"RDW Coordinator {index}", MagicMock(), f"GB{index:04d}", None
+        )
+        for index in range(PLATES)
+    ]
+
+
+def test_per_plate_entity_memory(coordinators: list[RdwDataUpdateCoordinator]) -> None:
+    """Shared descriptions and one DeviceInfo per plate hold less than per-entity copies."""
+
+    def _build(sensor_class: type[RdwSensor]) -> Callable[[], list[RdwSensor]]:
+        return lambda: [sensor_class(coordinator, key) for coordinator in coordinators for key in RDW_API_KEYS]
+
+    _, per_instance = _measure(_build(_PerInstanceSensor))
+    _, shared = _measure(_build(RdwSensor))
+
+    print(
+        f"\n{len(RDW_API_KEYS)} sensors per plate, {PLATES} plates: "
+        f"{per_instance / PLATES / 1024:.1f} KiB per plate with per-entity copies, "
+        f"{shared / PLATES / 1024:.1f} KiB with shared descriptions"
+    )
+    assert shared < per_instance
+
+
+def _rdw_rows_json(count: int) -> str:
+    """Return an RDW response body of count rows; categorical fields repeat a few values."""
+    return json.dumps([
+        {
+            key: f"{key.upper()} {index % CATEGORICAL_POOL}" if key in RDW_CATEGORICAL_KEYS else f"{index}-{position}"
+            for position, key in enumerate(RDW_API_KEYS)
+        }
+        for index in range(count)
+    ])
+
+
+def test_record_store_memory() -> None:
+    """Records with interned categorical values hold less than the decoded row dicts."""
+    body = _rdw_rows_json(RECORDS)
+    # Both sides decode the body, so each row starts with its own copy of every string
+    dicts, dict_bytes = _measure(lambda: json.loads(body))
+    records, record_bytes = _measure(lambda: [RdwRecord.from_mapping(row) for row in json.loads(body)])
+
+    print(
+        f"\n{RECORDS} records of {len(RDW_API_KEYS)} fields: "
+        f"{dict_bytes / RECORDS:.0f} bytes per plate as dicts, {record_bytes / RECORDS:.0f} bytes as RdwRecord"
+    )
+    assert records == dicts
+    assert record_bytes < dict_bytes
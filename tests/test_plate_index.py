@@ -0,0 +1,21 @@
+"""Tests for the fuzzy plate index."""
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.rdw_vehicle_info.plate_index import PlateIndex
+
+
+def test_removed_plates_are_no_longer_suggested() -> None:
+    """Removing a plate drops it from searches and leaves no stale skeleton or delete entries."""
+    index = PlateIndex()
+    assert index.add_many(["G727FN", "G727FB", "12AB34"]) == 3
+    assert [candidate.license_plate for candidate in index.search("G-727-F8")] == ["G727FB", "G727FN"]
+
+    assert index.remove_many(["G-727-FB", "G727FB", "not a plate"]) == 1
+    assert len(index) == 2
+    assert "G727FB" not in index
+    assert [candidate.license_plate for candidate in index.search("G-727-F8")] == ["G727FN"]
+
+    assert index.remove("G727FN") and index.remove("12AB34")
+    assert not index._by_skeleton and not index._by_delete
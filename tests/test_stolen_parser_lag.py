@@ -0,0 +1,92 @@
+"""Event-loop lag during a fleet's stolen checks, with pages parsed inline and in the worker pool."""
+import asyncio
+import statistics
+import time
+
+import pytest
+
+pytest.importorskip("homeassistant")
+pytest.importorskip("bs4")
+
+from aiohttp import ClientSession, web
+
+from custom_components.rdw_vehicle_info.api import HtmlParserPool, RdwApiClient
+from custom_components.rdw_vehicle_info.const import STOLEN_PARSE_MAX_PENDING, STOLEN_PARSE_WORKERS
+
+PLATES = [f"GB{index:04d}" for index in range(1_000)]
+CONCURRENCY = 4
+SAMPLE_INTERVAL = 0.005 # seconds
+
+# A results page padded with markup around the "no result" message the parser looks for
+_PAGE = (
+    "<html><body>"
+    + "".join(f'<div class="row"><span class="label">Veld {index}</span><a href="#{index}">waarde</a></div>' for index in range(60))
+    + '<div id="panel-4"><div class="card-block">'
+    "<p>Uw zoekopdracht naar het object heeft geen resultaat opgeleverd</p></div></div>"
+    "</body></html>"
+)
+
+
+async def _handle_stolen(request: web.Request) -> web.Response:
+    return web.Response(text=_PAGE, content_type="text/html")
+
+
+async def _sample_lag(lags: list[float], stop: asyncio.Event) -> None:
+    """Record how late the loop wakes up a task that sleeps SAMPLE_INTERVAL."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(SAMPLE_INTERVAL)
+        lags.append(time.perf_counter() - start - SAMPLE_INTERVAL)
+
+
+async def _refresh_lag(base_url: str, parser_pool: HtmlParserPool | None) -> list[float]:
+    """Check every plate CONCURRENCY at a time and return the loop lag samples."""
+    lags: list[float] = []
+    stop = asyncio.Event()
+    async with ClientSession() as session:
+        client = RdwApiClient(session, parser_pool=parser_pool)
+        client._stolen_base_url = f"{base_url}/stolen"
+        plates = iter(PLATES)
+
+        async def _worker() -> None:
+            for plate in plates:
+                assert await client.async_check_stolen(plate) is False
+
+        sampler = asyncio.create_task(_sample_lag(lags, stop))
+        await asyncio.gather(*(_worker() for _ in range(CONCURRENCY)))
+        stop.set()
+        await sampler
+    return lags
+
+
+async def _compare() -> tuple[list[float], list[float]]:
+    app = web.Application()
+    app.router.add_get("/stolen", _handle_stolen)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    base_url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+    pool = HtmlParserPool(STOLEN_PARSE_WORKERS, STOLEN_PARSE_MAX_PENDING)
+    try:
+        inline = await _refresh_lag(base_url, None)
+        pooled = await _refresh_lag(base_url, pool)
+    finally:
+        pool.shutdown()
+        await runner.cleanup()
+    return inline, pooled
+
+
+def _percentiles(lags: list[float]) -> str:
+    quantiles = statistics.quantiles(lags, n=100)
+    return f"p50 {quantiles[49] * 1000:.1f} ms, p99 {quantiles[98] * 1000:.1f} ms"
+
+
+def test_stolen_parser_loop_lag() -> None:
+    """Report event-loop lag while a 1,000-plate fleet runs its stolen checks."""
+    inline, pooled = asyncio.run(_compare())
+    print(
+        f"\n{len(PLATES)} stolen checks, {CONCURRENCY} at a time, {len(_PAGE) // 1024} KiB pages: "
+        f"inline parse {_percentiles(inline)}, worker pool {_percentiles(pooled)}"
+    )
+    assert len(inline) > 1 and len(pooled) > 1